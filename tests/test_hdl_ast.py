@@ -1,6 +1,10 @@
 # SPDX-License-Identifier: BSD-2-Clause
 
+import copy
+import pickle
+import sys
 import warnings
+import weakref
 from enum          import Enum
 
 from torii.hdl.ast import *
@@ -67,6 +71,25 @@ class ShapeTestCase(FHDLTestCase):
 		self.assertEqual(width, 1)
 		self.assertEqual(signed, False)
 
+	def test_hash(self):
+		self.assertEqual(hash(unsigned(2)), hash(Shape(2, False)))
+		self.assertEqual(len({ unsigned(2), Shape(2), signed(2) }), 2)
+
+	def test_immutable(self):
+		s1 = unsigned(2)
+		with self.assertRaisesRegex(
+			AttributeError,
+			r'^Cannot assign to attribute \'width\' of immutable Shape$'
+		):
+			s1.width = 3
+		self.assertEqual(s1.width, 2)
+
+	def test_intern(self):
+		self.assertIs(unsigned(8), Shape(8))
+		self.assertIs(signed(64), Shape(64, True))
+		self.assertIsNot(unsigned(128), unsigned(128))
+		self.assertEqual(unsigned(128), unsigned(128))
+
 	def test_unsigned(self):
 		s1 = unsigned(2)
 		self.assertIsInstance(s1, Shape)
@@ -129,6 +152,17 @@ class ShapeTestCase(FHDLTestCase):
 		self.assertEqual(s7.width, 0)
 		self.assertEqual(s7.signed, True)
 
+	def test_cast_range_equal(self):
+		# These ranges compare equal but have different shapes
+		s1 = Shape.cast(range(0, 3, 2))
+		self.assertEqual(s1.width, 1)
+		s2 = Shape.cast(range(0, 4, 2))
+		self.assertEqual(s2.width, 2)
+		s3 = Shape.cast(range(0, 0))
+		self.assertEqual(s3.signed, False)
+		s4 = Shape.cast(range(-1, -1))
+		self.assertEqual(s4.signed, True)
+
 	def test_cast_enum(self):
 		s1 = Shape.cast(UnsignedEnum)
 		self.assertEqual(s1.width, 2)
@@ -204,6 +238,30 @@ class ValueTestCase(FHDLTestCase):
 		):
 			Value.cast('str')
 
+	def test_weakref(self):
+		s = Signal()
+		stmt = s.eq(1)
+		self.assertIs(weakref.ref(s)(), s)
+		self.assertIs(weakref.ref(s + 1)(), None)
+		self.assertIs(weakref.ref(stmt)(), stmt)
+
+	def test_src_loc(self):
+		from torii.hdl import ast
+
+		enabled = ast._SRC_LOC_ENABLED
+		try:
+			ast._SRC_LOC_ENABLED = True
+			s = Signal()
+			self.assertEqual(s.src_loc, (__file__, s.src_loc[1]))
+			self.assertEqual((s + 1).src_loc[0], __file__)
+			self.assertEqual(Assign(s, 1).src_loc[0], __file__)
+			ast._SRC_LOC_ENABLED = False
+			self.assertIsNone(Signal().src_loc)
+			self.assertIsNone((s + 1).src_loc)
+			self.assertIsNone(s.eq(1).src_loc)
+		finally:
+			ast._SRC_LOC_ENABLED = enabled
+
 	def test_cast_enum(self):
 		e1 = Value.cast(UnsignedEnum.FOO)
 		self.assertIsInstance(e1, Const)
@@ -265,6 +323,13 @@ class ValueTestCase(FHDLTestCase):
 		self.assertIsInstance(s3.parts[2], Slice)
 		self.assertEqual(s3.parts[2].start, 4)
 		self.assertEqual(s3.parts[2].stop, 5)
+		s4 = Const(10, 4)[::-1]
+		self.assertRepr(s4, '''
+			(cat
+				(slice (const 4'd10) 3:4) (slice (const 4'd10) 2:3)
+				(slice (const 4'd10) 1:2) (slice (const 4'd10) 0:1)
+			)
+		''')
 
 	def test_getitem_wrong(self):
 		with self.assertRaisesRegex(
@@ -393,6 +458,13 @@ class ValueTestCase(FHDLTestCase):
 			'(cat (slice (const 9\'d256) 7:9) (slice (const 9\'d256) 0:7))'
 		)
 
+	def test_rotate_left_trivial(self):
+		s = Signal(8)
+		self.assertIs(s.rotate_left(0), s)
+		self.assertIs(s.rotate_left(8), s)
+		self.assertRepr(Const(0, 0).rotate_left(3), '(const 0\'d0)')
+		self.assertRepr(Signal(signed(4)).rotate_left(4), '(cat (sig $signal))')
+
 	def test_rotate_left_wrong(self):
 		with self.assertRaisesRegex(
 			TypeError,
@@ -418,6 +490,12 @@ class ValueTestCase(FHDLTestCase):
 			'(cat (slice (const 9\'d256) 2:9) (slice (const 9\'d256) 0:2))'
 		)
 
+	def test_rotate_right_trivial(self):
+		s = Signal(8)
+		self.assertIs(s.rotate_right(0), s)
+		self.assertIs(s.rotate_right(-16), s)
+		self.assertRepr(Const(0, 0).rotate_right(3), '(const 0\'d0)')
+
 	def test_rotate_right_wrong(self):
 		with self.assertRaisesRegex(
 			TypeError,
@@ -460,6 +538,40 @@ class ConstTestCase(FHDLTestCase):
 		with self.assertRaises(TypeError):
 			hash(Const(0))
 
+	def test_intern(self):
+		self.assertIs(Const(1), Const(1))
+		self.assertIs(Const(0b10110, signed(5)), Const(-10, signed(5)))
+		self.assertIsNot(Const(1), Const(1, 2))
+		self.assertIsNot(Const(1, 2), Const(1, signed(2)))
+		self.assertIsNot(Const(1024), Const(1024))
+		self.assertIsNot(Const(1, 128), Const(1, 128))
+
+	def test_from_bulk(self):
+		for shape in (unsigned(4), signed(4), unsigned(0), range(-3, 5)):
+			values = [0, 1, 7, 8, -1, -8, 300]
+			self.assertEqual(
+				list(map(repr, Const.from_bulk(values, shape))),
+				[repr(Const(value, Shape.cast(shape))) for value in values]
+			)
+		self.assertRepr(Const.from_bulk([-1], unsigned(4))[0], '(const 4\'d15)')
+		self.assertIs(Const.from_bulk([3], unsigned(8))[0], Const(3, 8))
+		self.assertEqual(Const.from_bulk([], unsigned(8)), [])
+
+	def test_from_bulk_wrong(self):
+		with self.assertRaisesRegex(
+			TypeError,
+			r'^Shape of Const.from_bulk\(\) must be explicitly signed or unsigned, e.g. unsigned\(4\), not 4$'
+		):
+			Const.from_bulk([-1], 4)
+
+	def test_copy(self):
+		for c in (Const(1), Const(-3, 4), Const(1024), Const(1, 128)):
+			for copied in (copy.copy(c), copy.deepcopy(c), pickle.loads(pickle.dumps(c))):
+				self.assertRepr(copied, repr(c))
+		self.assertIs(copy.deepcopy(Const(1)), Const(1))
+		s = Signal(8)
+		self.assertRepr(copy.deepcopy(s + 1), '(+ (sig s) (const 1\'d1))')
+
 
 class OperatorTestCase(FHDLTestCase):
 	def test_bool(self):
@@ -490,6 +602,14 @@ class OperatorTestCase(FHDLTestCase):
 		self.assertEqual(repr(v2), '(- (const 4\'sd0))')
 		self.assertEqual(v2.shape(), signed(5))
 
+	def test_abs(self):
+		s1 = Signal(4)
+		self.assertIs(abs(s1), s1)
+		s2 = Signal(signed(4))
+		v2 = abs(s2)
+		self.assertRepr(v2, '(m (>= (sig s2) (const 1\'d0)) (sig s2) (- (sig s2)))')
+		self.assertEqual(v2.shape(), signed(5))
+
 	def test_add(self):
 		v1 = Const(0, unsigned(4)) + Const(0, unsigned(6))
 		self.assertEqual(repr(v1), '(+ (const 4\'d0) (const 6\'d0))')
@@ -728,6 +848,22 @@ class OperatorTestCase(FHDLTestCase):
 		):
 			s.matches(1.0)
 
+	def test_as_const(self):
+		self.assertEqual((Const(3, 4) + Const(5, 4))._as_const(), 8)
+		self.assertEqual((Const(3, 4) - Const(5, 4))._as_const(), 30)
+		self.assertEqual((Const(3, signed(4)) - Const(5, 4))._as_const(), -2)
+		self.assertEqual((~Const(3, 4))._as_const(), 12)
+		self.assertEqual((Const(-1, 4) // Const(0, 4))._as_const(), 0)
+		self.assertEqual(Mux(Const(2, 2), Const(1, 4), Const(2, 4))._as_const(), 1)
+		self.assertEqual(Const(0b1011, 4).xor()._as_const(), 1)
+		with self.assertRaises(TypeError):
+			(Const(1) + Signal())._as_const()
+
+	def test_shape_cached(self):
+		v = Const(1, 4) + Const(1, signed(4))
+		self.assertIs(v.shape(), v.shape())
+		self.assertEqual(v.shape(), signed(6))
+
 	def test_hash(self):
 		with self.assertRaises(TypeError):
 			hash(Const(0) + Const(0))
@@ -813,6 +949,19 @@ class BitSelectTestCase(FHDLTestCase):
 		self.assertIsInstance(s1, Slice)
 		self.assertRepr(s1, '(slice (const 8\'d0) 1:3)')
 
+	def test_const_expr(self):
+		s1 = self.c.bit_select(Const(1) + 2, 2)
+		self.assertIsInstance(s1, Slice)
+		self.assertRepr(s1, '(slice (const 8\'d0) 3:5)')
+
+	def test_const_out_of_range(self):
+		s1 = self.c.bit_select(Const(6) + 1, 4)
+		self.assertIsInstance(s1, Part)
+		self.assertEqual(s1.shape(), unsigned(4))
+		s2 = self.c.bit_select(Const(-1, signed(2)), 2)
+		self.assertIsInstance(s2, Part)
+		self.assertEqual(s2.shape(), unsigned(2))
+
 	def test_width_wrong(self):
 		with self.assertRaises(TypeError):
 			self.c.bit_select(self.s, -1)
@@ -843,6 +992,14 @@ class WordSelectTestCase(FHDLTestCase):
 		self.assertIsInstance(s1, Slice)
 		self.assertRepr(s1, '(slice (const 8\'d0) 2:4)')
 
+	def test_const_out_of_range(self):
+		s1 = self.c.word_select(Const(1) - 2, 2)
+		self.assertIsInstance(s1, Part)
+		self.assertEqual(s1.shape(), unsigned(2))
+		s2 = self.c.word_select(Const(-1, signed(2)), 2)
+		self.assertIsInstance(s2, Part)
+		self.assertEqual(s2.shape(), unsigned(2))
+
 	def test_width_wrong(self):
 		with self.assertRaises(TypeError):
 			self.c.word_select(self.s, 0)
@@ -874,6 +1031,28 @@ class CatTestCase(FHDLTestCase):
 		c = Cat(1, 0)
 		self.assertEqual(repr(c), '(cat (const 1\'d1) (const 1\'d0))')
 
+	def test_single(self):
+		s1 = Signal(4)
+		self.assertIs(Cat(s1), s1)
+		self.assertIs(Cat([s1]), s1)
+		s2 = Signal(signed(4))
+		c2 = Cat(s2)
+		self.assertIsInstance(c2, Cat)
+		self.assertEqual(c2.shape(), unsigned(4))
+		self.assertIsInstance(Cat(), Cat)
+
+	def test_flatten(self):
+		a, b, c = Signal(name = 'a'), Signal(name = 'b'), Signal(name = 'c')
+		c1 = Cat(a, Cat(b, Cat(c)))
+		self.assertEqual(repr(c1), '(cat (sig a) (sig b) (sig c))')
+		self.assertEqual(c1.shape(), unsigned(3))
+
+	def test_as_const(self):
+		c1 = Cat(Const(0b10, 2), Const(0b1, 1), Const(0b011, 3))
+		self.assertEqual(c1._as_const(), 0b011110)
+		c2 = Cat(Const(-1, 2), Const(1, 2))
+		self.assertEqual(c2._as_const(), 0b0111)
+
 	def test_str_wrong(self):
 		with self.assertRaisesRegex(
 			TypeError,
@@ -903,6 +1082,15 @@ class ReplTestCase(FHDLTestCase):
 		s2 = Repl(Const(10), 0)
 		self.assertEqual(s2.shape(), unsigned(0))
 
+	def test_trivial(self):
+		s1 = Signal(4)
+		self.assertIs(Repl(s1, 1), s1)
+		self.assertRepr(Repl(s1, 0), '(const 0\'d0)')
+		s2 = Signal(signed(4))
+		r2 = Repl(s2, 1)
+		self.assertIsInstance(r2, Repl)
+		self.assertEqual(r2.shape(), unsigned(4))
+
 	def test_count_wrong(self):
 		with self.assertRaises(TypeError):
 			Repl(Const(10), -1)
@@ -931,6 +1119,13 @@ class ReplTestCase(FHDLTestCase):
 		):
 			Repl(2, 3)
 
+	def test_copy(self):
+		s = Signal(4)
+		r = Repl(s, 3)
+		for copied in (copy.copy(r), copy.deepcopy(r), pickle.loads(pickle.dumps(r))):
+			self.assertRepr(copied, '(repl (sig s) 3)')
+			self.assertEqual(copied.src_loc, r.src_loc)
+
 
 class ArrayTestCase(FHDLTestCase):
 	def test_acts_like_array(self):
@@ -1019,6 +1214,46 @@ class ArrayProxyTestCase(FHDLTestCase):
 		v = a[s]
 		self.assertEqual(repr(v), '(proxy (array [1, 2, 3]) (sig s))')
 
+	def test_signals(self):
+		s1 = Signal()
+		s2 = Signal()
+		i  = Signal()
+		v  = Array([s1, s2])[i]
+		self.assertEqual(v._lhs_signals(), SignalSet((s1, s2)))
+		self.assertEqual(v._rhs_signals(), SignalSet((i, s1, s2)))
+		# Callers may modify the returned sets
+		v._rhs_signals().add(Signal())
+		self.assertEqual(v._rhs_signals(), SignalSet((i, s1, s2)))
+
+	def test_signals_nested(self):
+		s1 = Signal(4)
+		s2 = Signal(4)
+		s3 = Signal(4)
+		s4 = Signal(4)
+		i = Signal()
+		j = Signal()
+		k = Signal()
+		p1 = Array([s1, s2])[i]
+		p2 = Array([s3, s4])[j]
+		p1._lhs_signals()
+		p1._rhs_signals()
+		p2._lhs_signals()
+		p2._rhs_signals()
+		outer = Array([p1, p2])[k]
+		self.assertEqual(outer._lhs_signals(), SignalSet((s1, s2, s3, s4)))
+		self.assertEqual(outer._rhs_signals(), SignalSet((k, i, s1, s2, j, s3, s4)))
+
+	def test_lhs_signals_wrong(self):
+		s = Signal(4)
+		i = Signal(1)
+		v = Array([s, Const(1)])[i]
+		for _ in range(2):
+			with self.assertRaisesRegex(
+				TypeError,
+				r'^Value \(const 1\'d1\) cannot be used in assignments$'
+			):
+				v._lhs_signals()
+
 
 class SignalTestCase(FHDLTestCase):
 	def test_shape(self):
@@ -1154,6 +1389,7 @@ class ClockSignalTestCase(FHDLTestCase):
 	def test_repr(self):
 		s1 = ClockSignal()
 		self.assertEqual(repr(s1), '(clk sync)')
+		self.assertIs(repr(s1), repr(s1))
 
 	def test_wrong_name_comb(self):
 		with self.assertRaisesRegex(
@@ -1184,6 +1420,7 @@ class ResetSignalTestCase(FHDLTestCase):
 	def test_repr(self):
 		s1 = ResetSignal()
 		self.assertEqual(repr(s1), '(rst sync)')
+		self.assertIs(repr(s1), repr(s1))
 
 	def test_wrong_name_comb(self):
 		with self.assertRaisesRegex(
@@ -1225,6 +1462,14 @@ class UserValueTestCase(FHDLTestCase):
 			self.assertEqual(uv.shape(), unsigned(1))
 			self.assertEqual(uv.lower_count, 1)
 
+	def test_cat_repl_not_lowered(self):
+		with warnings.catch_warnings():
+			warnings.filterwarnings(action = 'ignore', category = DeprecationWarning)
+			uv = MockUserValue(1)
+			self.assertIsInstance(Cat(uv), Cat)
+			self.assertIsInstance(Repl(uv, 1), Repl)
+			self.assertEqual(uv.lower_count, 0)
+
 
 class MockValueCastable(ValueCastable):
 	def __init__(self, dest):
@@ -1286,6 +1531,19 @@ class ValueCastableTestCase(FHDLTestCase):
 		):
 			MockValueCastableNoOverride()
 
+	def test_subclass_not_decorated(self):
+		class MockValueCastableSubclass(MockValueCastable):
+			def as_value(self):
+				return self.dest
+
+		MockValueCastable(Signal())
+		with self.assertRaisesRegex(
+			TypeError,
+			r'^Class \'MockValueCastableSubclass\' deriving from `ValueCastable` must '
+			r'decorate the `as_value` method with the `ValueCastable.lowermethod` decorator$'
+		):
+			MockValueCastableSubclass(Signal())
+
 	def test_memoized(self):
 		vc = MockValueCastableChanges(1)
 		sig1 = vc.as_value()
@@ -1355,6 +1613,44 @@ class InitialTestCase(FHDLTestCase):
 		i = Initial()
 		self.assertEqual(i.shape(), unsigned(1))
 
+	def test_shared(self):
+		self.assertIs(Initial(), Initial())
+		self.assertIsNone(Initial().src_loc)
+
+
+class StatementTestCase(FHDLTestCase):
+	def test_cast(self):
+		s = Signal()
+		a = s.eq(0)
+		b = s.eq(1)
+		self.assertEqual(Statement.cast(a), [a])
+		self.assertEqual(Statement.cast([a, [[b], []], (a,)]), [a, b, a])
+		self.assertRepr(Statement.cast([[a], b]), '''
+		(
+			(eq (sig s) (const 1'd0))
+			(eq (sig s) (const 1'd1))
+		)
+		''')
+
+	def test_cast_wrong(self):
+		with self.assertRaisesRegex(
+			TypeError,
+			r'^Object 1 is not an Torii statement$'
+		):
+			Statement.cast([Signal().eq(0), [1]])
+
+	def test_cast_str(self):
+		with self.assertRaisesRegex(
+			TypeError,
+			r'^Object \'ab\' is not an Torii statement$'
+		):
+			Statement.cast('ab')
+		with self.assertRaisesRegex(
+			TypeError,
+			r'^Object \'a\' is not an Torii statement$'
+		):
+			Statement.cast([Signal().eq(0), ['a']])
+
 
 class SwitchTestCase(FHDLTestCase):
 	def test_default_case(self):
@@ -1380,3 +1676,93 @@ class SwitchTestCase(FHDLTestCase):
 	def test_two_cases(self):
 		s = Switch(Const(0, 8), {('00001111', 123): []})
 		self.assertEqual(s.cases, {('00001111', '01111011'): []})
+
+
+class SignalSetTestCase(FHDLTestCase):
+	def test_contains(self):
+		s1 = Signal()
+		s2 = Signal()
+		c1 = ClockSignal('sync')
+		ss = SignalSet((s1, c1))
+		self.assertIn(s1, ss)
+		self.assertNotIn(s2, ss)
+		self.assertIn(ClockSignal('sync'), ss)
+		self.assertNotIn(ResetSignal('sync'), ss)
+		self.assertEqual(list(ss), [s1, c1])
+
+	def test_wrong(self):
+		with self.assertRaisesRegex(
+			TypeError,
+			r'^Object \(const 1\'d1\) is not an Torii signal$'
+		):
+			SignalSet((Const(1),))
+		s1 = Signal()
+		s2 = Signal()
+		SignalSet((s1, s2))
+		with self.assertRaisesRegex(
+			TypeError,
+			r'^Object \(proxy \(array \[\(sig s1\), \(sig s2\)\]\) \(sig s1\)\) is not an Torii signal$'
+		):
+			SignalSet((Array([s1, s2])[s1],))
+
+	def test_no_reference_cycle(self):
+		s = Signal()
+		refs = sys.getrefcount(s)
+		SignalSet((s,))
+		self.assertEqual(sys.getrefcount(s), refs)
+
+
+class SignalDictTestCase(FHDLTestCase):
+	def test_eq(self):
+		s1 = Signal()
+		s2 = Signal()
+		self.assertEqual(SignalDict([(s1, 1), (s2, 2)]), SignalDict([(s2, 2), (s1, 1)]))
+		self.assertNotEqual(SignalDict([(s1, 1), (s2, 2)]), SignalDict([(s1, 1), (s2, 3)]))
+		self.assertNotEqual(SignalDict([(s1, 1)]), SignalDict([(s1, 1), (s2, 2)]))
+		self.assertNotEqual(SignalDict([(s1, 1)]), [(s1, 1)])
+
+
+class ValueKeyTestCase(FHDLTestCase):
+	def test_sample(self):
+		s = Signal()
+		self.assertEqual(ValueKey(Sample(s, 1, 'sync')), ValueKey(Sample(s, 1, 'sync')))
+		self.assertNotEqual(ValueKey(Sample(s, 1, 'sync')), ValueKey(Sample(s, 1, 'pix')))
+		self.assertNotEqual(ValueKey(Sample(s, 1, 'sync')), ValueKey(Sample(s, 2, 'sync')))
+
+	def test_compound_hash_cached(self):
+		s = Signal(8)
+		v = (s + 1)[0:4]
+		self.assertEqual(hash(ValueKey(v)), hash(ValueKey(v)))
+		self.assertEqual(v._value_key_hash, hash(ValueKey(v)))
+		self.assertEqual(ValueKey(v), ValueKey((s + 1)[0:4]))
+		self.assertNotEqual(ValueKey(v), ValueKey((s + 2)[0:4]))
+
+	def test_array_proxy_hash(self):
+		s = Signal(8)
+		i = Signal()
+		a = s[0:4]
+		b = s[4:8]
+		vs = ValueSet([a, b])
+		p = Array([a, b])[i]
+		vs.add(p)
+		self.assertEqual(len(vs), 3)
+		self.assertIn(p, vs)
+		self.assertIsInstance(hash(ValueKey(p)), int)
+
+	def test_lt(self):
+		a = Signal(8)
+		b = Signal(8)
+		self.assertTrue(ValueKey(a) < ValueKey(b))
+		self.assertFalse(ValueKey(b) < ValueKey(a))
+		self.assertTrue(ValueKey(Const(1, 4)) < ValueKey(Const(3, 4)))
+		self.assertTrue(ValueKey(a[0:2]) < ValueKey(a[2:4]))
+		self.assertTrue(ValueKey(a[0:4]) < ValueKey(b[0:2]))
+		c = Const(0)
+		s = a[0:2]
+		for key, value in zip(sorted([ValueKey(s), ValueKey(c), ValueKey(a)]), (a, c, s)):
+			self.assertIs(key.value, value)
+		with self.assertRaisesRegex(
+			TypeError,
+			r'^Object \(\+ \(sig a\) \(const 1\'d1\)\) cannot be used as a key in value collections$'
+		):
+			ValueKey(a + 1) < ValueKey(a)
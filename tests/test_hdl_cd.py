@@ -66,10 +66,12 @@ class ClockDomainTestCase(FHDLTestCase):
 		self.assertEqual(sync.name, 'sync')
 		self.assertEqual(sync.clk.name, 'clk')
 		self.assertEqual(sync.rst.name, 'rst')
+		self.assertEqual(repr(sync.clk), '(sig clk)')
 		sync.rename('pix')
 		self.assertEqual(sync.name, 'pix')
 		self.assertEqual(sync.clk.name, 'pix_clk')
 		self.assertEqual(sync.rst.name, 'pix_rst')
+		self.assertEqual(repr(sync.clk), '(sig pix_clk)')
 
 	def test_rename_reset_less(self):
 		sync = ClockDomain(reset_less = True)
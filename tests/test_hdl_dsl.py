@@ -175,7 +175,7 @@ class DSLTestCase(FHDLTestCase):
 		m._flush()
 		self.assertRepr(m._statements, '''
 		(
-			(switch (cat (sig s1))
+			(switch (sig s1)
 				(case 1 (eq (sig c1) (const 1'd1)))
 			)
 		)
@@ -225,10 +225,10 @@ class DSLTestCase(FHDLTestCase):
 		m._flush()
 		self.assertRepr(m._statements, '''
 		(
-			(switch (cat (sig s1))
+			(switch (sig s1)
 				(case 1 (eq (sig c1) (const 1'd1)))
 			)
-			(switch (cat (sig s2))
+			(switch (sig s2)
 				(case 1 (eq (sig c2) (const 1'd1)))
 			)
 		)
@@ -243,9 +243,9 @@ class DSLTestCase(FHDLTestCase):
 		m._flush()
 		self.assertRepr(m._statements, '''
 		(
-			(switch (cat (sig s1))
+			(switch (sig s1)
 				(case 1 (eq (sig c1) (const 1'd1))
-					(switch (cat (sig s2))
+					(switch (sig s2)
 						(case 1 (eq (sig c2) (const 1'd1)))
 					)
 				)
@@ -264,10 +264,10 @@ class DSLTestCase(FHDLTestCase):
 		m._flush()
 		self.assertRepr(m._statements, '''
 		(
-			(switch (cat (sig s1))
+			(switch (sig s1)
 				(case 1
 					(eq (sig c1) (const 1'd1))
-					(switch (cat (sig s2))
+					(switch (sig s2)
 						(case 1 (eq (sig c2) (const 1'd1)))
 					)
 				)
@@ -329,7 +329,7 @@ class DSLTestCase(FHDLTestCase):
 		m._flush()
 		self.assertRepr(m._statements, '''
 		(
-			(switch (cat (b (sig w1)))
+			(switch (b (sig w1))
 				(case 1 (eq (sig c1) (const 1'd1)))
 			)
 		)
@@ -581,7 +581,7 @@ class DSLTestCase(FHDLTestCase):
 				)
 				(case 1
 					(eq (sig b) (~ (sig b)))
-					(switch (cat (sig c))
+					(switch (sig c)
 						(case 1
 							(eq (sig fsm_state) (const 1'd0)))
 					)
@@ -658,6 +658,20 @@ class DSLTestCase(FHDLTestCase):
 		)
 		''')
 
+	def test_FSM_state_shape(self):
+		m = Module()
+		with m.FSM() as fsm:
+			nxt = fsm.state + 1
+			self.assertEqual(len(nxt), len(fsm.state) + 1)
+			with m.State('A'):
+				m.next = 'B'
+			with m.State('B'):
+				m.next = 'C'
+			with m.State('C'):
+				m.next = 'A'
+		self.assertEqual(len(fsm.state), 2)
+		self.assertEqual(len(nxt), 3)
+
 	def test_FSM_empty(self):
 		m = Module()
 		with m.FSM():
@@ -757,7 +771,7 @@ class DSLTestCase(FHDLTestCase):
 		m.d.comb += self.c2.eq(1)
 		self.assertRepr(m._statements, '''
 		(
-			(switch (cat (b (sig w1)))
+			(switch (b (sig w1))
 				(case 1 (eq (sig c1) (const 1'd1)))
 			)
 			(eq (sig c2) (const 1'd1))
@@ -560,7 +560,7 @@ class EnableInserterTestCase(FHDLTestCase):
 		mem = Memory(width = 8, depth = 4)
 		f = EnableInserter(self.c1)(mem.write_port()).elaborate(platform = None)
 		self.assertRepr(f.named_ports['EN'][0], '''
-		(m (sig c1) (cat (repl (slice (sig mem_w_en) 0:1) 8)) (const 8'd0))
+		(m (sig c1) (repl (slice (sig mem_w_en) 0:1) 8) (const 8'd0))
 		''')
 
 
@@ -661,3 +661,50 @@ class UserValueRecursiveTestCase(UserValueTestCase):
 			self.uv = MockUserValue(MockUserValue(self.s))
 
 	# inherit the test_lower method from UserValueTestCase because the checks are the same
+
+
+class ValueTransformerTestCase(FHDLTestCase):
+	def test_interned_const_src_loc(self):
+		class ZeroSignals(ValueTransformer):
+			def on_Signal(self, value):
+				return Const(0)
+
+		self.assertRepr(ZeroSignals()(Signal() + 1), '(+ (const 1\'d0) (const 1\'d1))')
+		self.assertIsNone(Const(0).src_loc)
+
+	def test_initial_src_loc(self):
+		from torii.hdl import ast
+
+		class InitialSignals(ValueTransformer):
+			def on_Signal(self, value):
+				return Initial()
+
+		enabled = ast._SRC_LOC_ENABLED
+		try:
+			ast._SRC_LOC_ENABLED = True
+			self.assertRepr(InitialSignals()(Signal() + 1), '(+ (initial) (const 1\'d1))')
+		finally:
+			ast._SRC_LOC_ENABLED = enabled
+		self.assertIsNone(Initial().src_loc)
+
+	def test_short_circuit_src_loc(self):
+		from torii.hdl import ast
+
+		class ReplaceSignal(ValueTransformer):
+			def on_Signal(self, value):
+				return b
+
+		enabled = ast._SRC_LOC_ENABLED
+		try:
+			ast._SRC_LOC_ENABLED = True
+			a = Signal(signed(4))
+			b = Signal(4)
+			c = Cat(a)
+			r = Repl(a, 1)
+			self.assertNotEqual(c.src_loc, a.src_loc)
+			self.assertIs(ReplaceSignal()(c), b)
+			self.assertEqual(b.src_loc, a.src_loc)
+			self.assertIs(ReplaceSignal()(r), b)
+			self.assertEqual(b.src_loc, a.src_loc)
+		finally:
+			ast._SRC_LOC_ENABLED = enabled
@@ -1,18 +1,18 @@
 # SPDX-License-Identifier: BSD-2-Clause
 
 import functools
+import re
 import warnings
 from abc               import ABCMeta, abstractmethod
-from collections       import OrderedDict
 from collections.abc   import (
 	Iterable, MutableMapping, MutableSequence, MutableSet
 )
 from enum              import Enum
-from itertools         import chain
-from typing            import Iterator, Optional, Tuple, Union
+from os                import getenv
+from typing            import Dict, Iterator, Optional, Tuple, Union
 
 from ._unused          import MustUse, UnusedMustUse
-from ..util            import tracer, flatten, union
+from ..util            import tracer, flatten
 from ..util.decorators import final, deprecated
 from ..util.units      import bits_for
 
@@ -28,9 +28,16 @@ __all__ = (
 	'ValueKey', 'ValueDict', 'ValueSet', 'SignalKey', 'SignalDict', 'SignalSet',
 )
 
+# Source locations are recorded for every AST node by walking the caller's frame, which
+# can be disabled for large designs by setting ``TORII_NO_SRC_LOC`` to ``1``, ``true``, or ``yes``.
+_SRC_LOC_ENABLED = getenv('TORII_NO_SRC_LOC', default = '').strip().lower() not in ('1', 'true', 'yes')
+
 
 class DUID:
 	'''Deterministic Unique IDentifier.'''
+
+	__slots__ = ()
+
 	__next_uid = 0
 
 	def __init__(self) -> None:
@@ -53,6 +60,31 @@ class ShapeCastable:
 		return self
 
 
+# Ranges are keyed on (start, stop, step) rather than on the range itself, as ranges
+# compare equal by their elements, e.g. ``range(0, 0) == range(-1, -1)``.
+@functools.lru_cache(maxsize = 4096)
+def _range_shape(start: int, stop: int, step: int) -> Tuple[int, bool]:
+	if len(range(start, stop, step)) == 0:
+		return (0, start < 0)
+	signed = start < 0 or (stop - step) < 0
+	width  = max(
+		bits_for(start, signed),
+		bits_for(stop - step, signed)
+	)
+	return (width, signed)
+
+
+@functools.lru_cache(maxsize = 4096)
+def _enum_shape(obj: type) -> Tuple[int, bool]:
+	min_value = min(member.value for member in obj)
+	max_value = max(member.value for member in obj)
+	if not isinstance(min_value, int) or not isinstance(max_value, int):
+		raise TypeError('Only enumerations with integer values can be used as value shapes')
+	signed = min_value < 0 or max_value < 0
+	width  = max(bits_for(min_value, signed), bits_for(max_value, signed))
+	return (width, signed)
+
+
 class Shape:
 	'''Bit width and signedness of a value.
 
@@ -77,13 +109,39 @@ class Shape:
 		The number of bits in the representation, including the sign bit (if any).
 	signed : bool
 		If ``False``, the value is unsigned. If ``True``, the value is signed two's complement.
+
+	Shapes are immutable and hashable, and common shapes are interned, so constructing one of them
+	returns a shared instance.
 	'''  # noqa: E101
-	def __init__(self, width: int = 1, signed: bool = False) -> None:
+
+	__slots__ = ('width', 'signed', '_hash')
+
+	def __new__(cls, width: int = 1, signed: bool = False) -> 'Shape':
 		if not isinstance(width, int) or width < 0:
 			raise TypeError(f'Width must be a non-negative integer, not {width!r}')
 
-		self.width = width
-		self.signed = signed
+		if cls is Shape:
+			self = _SHAPE_INTERN.get((width, signed))
+			if self is not None:
+				return self
+
+		self = super().__new__(cls)
+		object.__setattr__(self, 'width', width)
+		object.__setattr__(self, 'signed', signed)
+		object.__setattr__(self, '_hash', hash((width, signed)))
+		return self
+
+	def __setattr__(self, name: str, value: object) -> None:
+		raise AttributeError(f'Cannot assign to attribute \'{name}\' of immutable Shape')
+
+	def __delattr__(self, name: str) -> None:
+		raise AttributeError(f'Cannot delete attribute \'{name}\' of immutable Shape')
+
+	def __reduce__(self):
+		return (type(self), (self.width, self.signed))
+
+	def __hash__(self) -> int:
+		return self._hash
 
 	# TODO(nmigen-0.4): remove
 	def __iter__(self) -> Iterator[Tuple[int, bool]]:
@@ -94,28 +152,19 @@ class Shape:
 		obj: Union['Shape', int, range, type, ShapeCastable], *,
 		src_loc_at: int = 0
 	) -> 'Shape':
+		handler = _SHAPE_CAST_DISPATCH.get(type(obj))
+		if handler is not None:
+			return handler(obj)
+
 		while True:
 			if isinstance(obj, Shape):
 				return obj
 			elif isinstance(obj, int):
 				return Shape(obj)
 			elif isinstance(obj, range):
-				if len(obj) == 0:
-					return Shape(0, obj.start < 0)
-				signed = obj.start < 0 or (obj.stop - obj.step) < 0
-				width  = max(
-					bits_for(obj.start, signed),
-					bits_for(obj.stop - obj.step, signed)
-				)
-				return Shape(width, signed)
+				return Shape(*_range_shape(obj.start, obj.stop, obj.step))
 			elif isinstance(obj, type) and issubclass(obj, Enum):
-				min_value = min(member.value for member in obj)
-				max_value = max(member.value for member in obj)
-				if not isinstance(min_value, int) or not isinstance(max_value, int):
-					raise TypeError('Only enumerations with integer values can be used as value shapes')
-				signed = min_value < 0 or max_value < 0
-				width  = max(bits_for(min_value, signed), bits_for(max_value, signed))
-				return Shape(width, signed)
+				return Shape(*_enum_shape(obj))
 			elif isinstance(obj, ShapeCastable):
 				new_obj = obj.as_shape()
 			else:
@@ -146,6 +195,24 @@ class Shape:
 		return self.width == other.width and self.signed == other.signed
 
 
+_SHAPE_INTERN: Dict[Tuple[int, bool], Shape] = {}
+_SHAPE_INTERN.update(
+	((width, signed), Shape(width, signed)) for width in range(65) for signed in (False, True)
+)
+
+
+def _cast_identity(obj):
+	return obj
+
+
+# Exact-type fast path for `Shape.cast`, anything else goes through the full cast.
+_SHAPE_CAST_DISPATCH = {
+	Shape: _cast_identity,
+	int:   Shape,
+	range: lambda obj: Shape(*_range_shape(obj.start, obj.stop, obj.step)),
+}
+
+
 def unsigned(width: int) -> Shape:
 	'''Shorthand for ``Shape(width, signed=False)``.'''
 	return Shape(width, signed = False)
@@ -158,7 +225,53 @@ def signed(width: int) -> Shape:
 
 ValueCastType = Union['Value', int, Enum, 'ValueCastable']
 
+# Match and case patterns may only contain these characters, of which only spaces and tabs
+# are whitespace, so removing those two is equivalent to ``''.join(pattern.split())``.
+_PATTERN_INVALID    = re.compile(r'[^01\- \t]')
+_PATTERN_WHITESPACE = str.maketrans('', '', ' \t')
+
+@functools.lru_cache(maxsize = 1024)
+def _parse_str_pattern(pattern: str, width: int) -> Tuple[int, int]:
+	'''Parse a string match pattern into a ``(mask, value)`` pair.'''
+	if _PATTERN_INVALID.search(pattern):
+		raise SyntaxError(
+			f'Match pattern \'{pattern}\' must consist of 0, 1, and - (don\'t care) bits, and may include whitespace'
+		)
+
+	bits = pattern.translate(_PATTERN_WHITESPACE)
+	if len(bits) != width:
+		raise SyntaxError(
+			f'Match pattern \'{pattern}\' must have the same width as match value (which is {width})'
+		)
+
+	mask  = int(bits.replace('0', '1').replace('-', '0'), 2)
+	value = int(bits.replace('-', '0'), 2)
+	return (mask, value)
+
+
+# Incremented whenever the shape of an existing `Signal` changes (e.g. the state of an FSM once all of
+# its states are known), which invalidates every memoized expression shape.
+_shape_generation = 0
+
+def _cached_shape(shape):
+	'''Memoize the result of ``shape()`` on values that are immutable after construction.'''
+	@functools.wraps(shape)
+	def wrapper(self) -> Shape:
+		try:
+			generation, result = self._shape
+			if generation == _shape_generation:
+				return result
+		except AttributeError:
+			pass
+		result = shape(self)
+		self._shape = (_shape_generation, result)
+		return result
+	return wrapper
+
+
 class Value(metaclass = ABCMeta):
+	__slots__ = ('src_loc', '__weakref__')
+
 	@staticmethod
 	def cast(obj: ValueCastType ) -> 'Value':
 		'''Converts ``obj`` to an Torii value.
@@ -167,6 +280,10 @@ class Value(metaclass = ABCMeta):
 		all integers are converted to a :class:`Const` with a shape that fits every member.
 		:class:`ValueCastable` objects are recursively cast to an Torii value.
 		'''
+		handler = _VALUE_CAST_DISPATCH.get(type(obj))
+		if handler is not None:
+			return handler(obj)
+
 		while True:
 			if isinstance(obj, Value):
 				return obj
@@ -184,7 +301,7 @@ class Value(metaclass = ABCMeta):
 
 	def __init__(self, *, src_loc_at: int = 0) -> None:
 		super().__init__()
-		self.src_loc = tracer.get_src_loc(1 + src_loc_at)
+		self.src_loc = tracer.get_src_loc(1 + src_loc_at) if _SRC_LOC_ENABLED else None
 
 	def __bool__(self) -> None:
 		raise TypeError('Attempted to convert Torii value to Python boolean')
@@ -290,11 +407,9 @@ class Value(metaclass = ABCMeta):
 		return Operator('>=', [self, other])
 
 	def __abs__(self) -> 'Value':
-		width, signed = self.shape()
-		if signed:
-			return Mux(self >= 0, self, -self)
-		else:
+		if not self.shape().signed:
 			return self
+		return Mux(self >= 0, self, -self)
 
 	def __len__(self) -> int:
 		return self.shape().width
@@ -309,9 +424,9 @@ class Value(metaclass = ABCMeta):
 			return Slice(self, key, key + 1)
 		elif isinstance(key, slice):
 			start, stop, step = key.indices(n)
-			if step != 1:
-				return Cat(self[i] for i in range(start, stop, step))
-			return Slice(self, start, stop)
+			if step == 1:
+				return Slice(self, start, stop)
+			return Cat([Slice(self, i, i + 1) for i in range(start, stop, step)])
 		else:
 			raise TypeError(f'Cannot index value with {key!r}')
 
@@ -403,8 +518,9 @@ class Value(metaclass = ABCMeta):
 		Part, out
 			Selected part of the ``Value``
 		'''
-		offset = Value.cast(offset)
-		if type(offset) is Const and isinstance(width, int):
+		offset = _fold_const(Value.cast(offset))
+		# Out of range offsets keep the `Part`, a slice would be narrower than ``width``
+		if type(offset) is Const and isinstance(width, int) and 0 <= offset.value <= len(self) - width:
 			return self[offset.value:offset.value + width]
 		return Part(self, offset, width, stride = 1, src_loc_at = 1)
 
@@ -426,8 +542,8 @@ class Value(metaclass = ABCMeta):
 		Part, out
 			Selected part of the ``Value``
 		'''
-		offset = Value.cast(offset)
-		if type(offset) is Const and isinstance(width, int):
+		offset = _fold_const(Value.cast(offset))
+		if type(offset) is Const and isinstance(width, int) and 0 <= offset.value and (offset.value + 1) * width <= len(self):
 			return self[offset.value * width:(offset.value + 1) * width]
 		return Part(self, offset, width, stride = width, src_loc_at = 1)
 
@@ -447,40 +563,26 @@ class Value(metaclass = ABCMeta):
 		Value, out
 			``1`` if any pattern matches the value, ``0`` otherwise.
 		'''
+		width   = len(self)
 		matches = []
 		for pattern in patterns:
-			if not isinstance(pattern, (int, str, Enum)):
-				raise SyntaxError(
-					f'Match pattern must be an integer, a string, or an enumeration, not {pattern!r}'
-				)
-
-			if isinstance(pattern, str) and any(bit not in '01- \t' for bit in pattern):
-				raise SyntaxError(
-					f'Match pattern \'{pattern}\' must consist of 0, 1, and - (don\'t care) bits, and may include whitespace'
-				)
-
-			if (isinstance(pattern, str) and len(''.join(pattern.split())) != len(self)):
-				raise SyntaxError(
-					f'Match pattern \'{pattern}\' must have the same width as match value (which is {len(self)})'
-				)
-
-			if isinstance(pattern, int) and bits_for(pattern) > len(self):
-				warnings.warn(
-					f'Match pattern \'{pattern:b}\' is wider than match value (which has width {len(self)}); comparison will never be true',
-					SyntaxWarning, stacklevel = 3
-				)
-				continue
 			if isinstance(pattern, str):
-				pattern = ''.join(pattern.split()) # remove whitespace
-				mask    = int(pattern.replace('0', '1').replace('-', '0'), 2)
-				pattern = int(pattern.replace('-', '0'), 2)
+				mask, pattern = _parse_str_pattern(pattern, width)
 				matches.append((self & mask) == pattern)
 			elif isinstance(pattern, int):
+				if bits_for(pattern) > width:
+					warnings.warn(
+						f'Match pattern \'{pattern:b}\' is wider than match value (which has width {width}); comparison will never be true',
+						SyntaxWarning, stacklevel = 3
+					)
+					continue
 				matches.append(self == pattern)
 			elif isinstance(pattern, Enum):
 				matches.append(self == pattern.value)
 			else:
-				assert False
+				raise SyntaxError(
+					f'Match pattern must be an integer, a string, or an enumeration, not {pattern!r}'
+				)
 		if not matches:
 			return Const(0)
 		elif len(matches) == 1:
@@ -547,8 +649,11 @@ class Value(metaclass = ABCMeta):
 		'''
 		if not isinstance(amount, int):
 			raise TypeError(f'Rotate amount must be an integer, not {amount!r}')
-		amount %= len(self)
-		return Cat(self[-amount:], self[:-amount]) # meow :3
+		n = len(self)
+		if n == 0 or amount % n == 0:
+			return Cat(self)
+		amount = n - amount % n
+		return Cat(Slice(self, amount, n), Slice(self, 0, amount)) # meow :3
 
 	def rotate_right(self, amount: int) -> 'Value':
 		'''Rotate right by constant amount.
@@ -565,8 +670,11 @@ class Value(metaclass = ABCMeta):
 		'''
 		if not isinstance(amount, int):
 			raise TypeError(f'Rotate amount must be an integer, not {amount!r}')
-		amount %= len(self)
-		return Cat(self[amount:], self[:amount])
+		n = len(self)
+		if n == 0 or amount % n == 0:
+			return Cat(self)
+		amount %= n
+		return Cat(Slice(self, amount, n), Slice(self, 0, amount))
 
 	def eq(self, value: 'Value') -> 'Assign':
 		'''Assignment.
@@ -631,7 +739,14 @@ class Const(Value):
 	width : int
 	signed : bool
 	'''
-	src_loc = None
+
+	__slots__ = ('value', 'width', 'signed')
+
+	# Small constants are immutable and created constantly, so they are interned much like
+	# CPython does for small integers. The key is the normalized (value, width, signed).
+	_intern: Dict[Tuple[int, int, bool], 'Const'] = {}
+	_INTERN_VALUES = range(-256, 257)
+	_INTERN_WIDTH  = 64
 
 	@staticmethod
 	def normalize(value: int, shape: Tuple[int, bool]):
@@ -642,24 +757,100 @@ class Const(Value):
 			value |= ~mask
 		return value
 
-	def __init__(
-		self, value: int, shape: Optional[Union[int, Tuple[int, bool]]] = None, *,
+	def __new__(
+		cls, value: int, shape: Optional[Union[int, Tuple[int, bool]]] = None, *,
 		src_loc_at: int = 0
-	) -> None:
-		# We deliberately do not call Value.__init__ here.
-		self.value = int(value)
+	) -> 'Const':
+		value = int(value)
 		if shape is None:
-			shape = Shape(bits_for(self.value), signed = self.value < 0)
+			shape = Shape(bits_for(value), signed = value < 0)
 		elif isinstance(shape, int):
-			shape = Shape(shape, signed = self.value < 0)
+			shape = Shape(shape, signed = value < 0)
 		else:
 			shape = Shape.cast(shape, src_loc_at = 1 + src_loc_at)
-		self.width, self.signed = shape
-		self.value = self.normalize(self.value, shape)
+		width, signed = shape
+		return cls._get(cls.normalize(value, shape), width, signed)
+
+	@classmethod
+	def _get(cls, value: int, width: int, signed: bool) -> 'Const':
+		key  = (value, width, signed)
+		self = cls._intern.get(key)
+		if self is None:
+			# We deliberately do not call Value.__init__ here.
+			self = super().__new__(cls)
+			self.src_loc = None
+			self.value   = value
+			self.width   = width
+			self.signed  = signed
+			if value in cls._INTERN_VALUES and width <= cls._INTERN_WIDTH:
+				cls._intern[key] = self
+		return self
+
+	def _is_interned(self) -> bool:
+		return self._intern.get((self.value, self.width, self.signed)) is self
+
+	def __reduce__(self):
+		return (Const, (self.value, Shape(self.width, self.signed)))
+
+	@classmethod
+	def from_bulk(
+		cls, values: Iterable[int], shape: Union[Shape, range, type, ShapeCastable], *,
+		src_loc_at: int = 0
+	) -> list:
+		'''Create a list of constants that all share the same shape.
+
+		This is equivalent to ``[Const(value, Shape.cast(shape)) for value in values]``, but the
+		shape is only cast once and the normalization mask is computed up front, which is
+		considerably faster when building large constant tables, e.g. for an :class:`Array` or ROM.
+
+		Parameters
+		----------
+		values : iterable of int
+			Values of the constants.
+		shape : Shape or ShapeCastable
+			Shape of every constant. Unlike :class:`Const`, a bare integer width is not accepted, as
+			the signedness cannot be inferred from each value while sharing one shape.
+
+		Returns
+		-------
+		list of Const
+
+		Raises
+		------
+		TypeError
+			If ``shape`` is an integer.
+		'''
+		if isinstance(shape, int):
+			raise TypeError(
+				f'Shape of Const.from_bulk() must be explicitly signed or unsigned, e.g. unsigned({shape}), '
+				f'not {shape!r}'
+			)
+		width, signed = Shape.cast(shape, src_loc_at = 1 + src_loc_at)
+		mask = (1 << width) - 1
+		sign = 1 << (width - 1) if signed and width > 0 else 0
+		get  = cls._get
+
+		consts = []
+		for value in values:
+			value = int(value) & mask
+			if value & sign:
+				value |= ~mask
+			consts.append(get(value, width, signed))
+		return consts
+
+	def __init__(
+		self, value: int, shape: Optional[Union[int, Tuple[int, bool]]] = None, *,
+		src_loc_at: int = 0
+	) -> None:
+		# Everything is done in __new__ so that interned constants are not re-initialized.
+		pass
 
 	def shape(self) -> Shape:
 		return Shape(self.width, self.signed)
 
+	def __len__(self) -> int:
+		return self.width
+
 	def _rhs_signals(self) -> 'SignalSet':
 		return SignalSet()
 
@@ -671,105 +862,189 @@ class Const(Value):
 
 
 class AnyValue(Value, DUID):
+	__slots__ = ('width', 'signed', 'duid')
+
 	def __init__(
 		self, shape: Union[Shape, int, Tuple[int, bool], range, type, ShapeCastable] , *,
 		src_loc_at: int = 0
 	) -> None:
 		super().__init__(src_loc_at = src_loc_at)
-		self.width, self.signed = Shape.cast(shape, src_loc_at = 1 + src_loc_at)
+		self._width, self._signed = Shape.cast(shape, src_loc_at = 1 + src_loc_at)
 		if not isinstance(self.width, int) or self.width < 0:
 			raise TypeError(f'Width must be a non-negative integer, not {self.width!r}')
 
 	def shape(self) -> Shape:
 		return Shape(self.width, self.signed)
 
+	def __len__(self) -> int:
+		return self.width
+
 	def _rhs_signals(self) -> 'SignalSet':
 		return SignalSet()
 
 
 @final
 class AnyConst(AnyValue):
+	__slots__ = ()
+
 	def __repr__(self) -> str:
 		return f'(anyconst {self.width}\'{"s" if self.signed else ""})'
 
 
 @final
 class AnySeq(AnyValue):
+	__slots__ = ()
+
 	def __repr__(self) -> str:
 		return f'(anyseq {self.width}\'{"s" if self.signed else ""})'
 
 
+# Indexed by `(a_signed << 1) | b_signed`, maps the operand widths to the resulting (width, signed)
+_BITWISE_BINARY_SHAPES = (
+	# both operands unsigned
+	lambda a_bits, b_bits: (max(a_bits, b_bits), False),
+	# first operand unsigned (add sign bit), second operand signed
+	lambda a_bits, b_bits: (max(a_bits + 1, b_bits), True),
+	# first signed, second operand unsigned (add sign bit)
+	lambda a_bits, b_bits: (max(a_bits, b_bits + 1), True),
+	# both operands signed
+	lambda a_bits, b_bits: (max(a_bits, b_bits), True),
+)
+
+def _bitwise_binary_shape(a_shape: Shape, b_shape: Shape) -> Shape:
+	a_bits, a_sign = a_shape
+	b_bits, b_sign = b_shape
+	return Shape(*_BITWISE_BINARY_SHAPES[(bool(a_sign) << 1) | bool(b_sign)](a_bits, b_bits))
+
+def _add_sub_shape(a_shape: Shape, b_shape: Shape) -> Shape:
+	width, signed = _bitwise_binary_shape(a_shape, b_shape)
+	return Shape(width + 1, signed)
+
+def _shift_left_shape(a_shape: Shape, b_shape: Shape) -> Shape:
+	assert not b_shape.signed
+	return Shape(a_shape.width + 2 ** b_shape.width - 1, a_shape.signed)
+
+def _shift_right_shape(a_shape: Shape, b_shape: Shape) -> Shape:
+	assert not b_shape.signed
+	return Shape(a_shape.width, a_shape.signed)
+
+# Maps (operator, number of operands) to a function computing the result shape from the operand shapes
+_OPERATOR_SHAPES = {
+	('+',  1): lambda a: Shape(a.width, a.signed),
+	('~',  1): lambda a: Shape(a.width, a.signed),
+	('-',  1): lambda a: Shape(a.width + 1, True),
+	('b',  1): lambda a: Shape(1, False),
+	('r|', 1): lambda a: Shape(1, False),
+	('r&', 1): lambda a: Shape(1, False),
+	('r^', 1): lambda a: Shape(1, False),
+	('u',  1): lambda a: Shape(a.width, False),
+	('s',  1): lambda a: Shape(a.width, True),
+
+	('+',  2): _add_sub_shape,
+	('-',  2): _add_sub_shape,
+	('*',  2): lambda a, b: Shape(a.width + b.width, a.signed or b.signed),
+	('//', 2): lambda a, b: Shape(a.width + b.signed, a.signed or b.signed),
+	('%',  2): lambda a, b: Shape(b.width, b.signed),
+	('<',  2): lambda a, b: Shape(1, False),
+	('<=', 2): lambda a, b: Shape(1, False),
+	('==', 2): lambda a, b: Shape(1, False),
+	('!=', 2): lambda a, b: Shape(1, False),
+	('>',  2): lambda a, b: Shape(1, False),
+	('>=', 2): lambda a, b: Shape(1, False),
+	('&',  2): _bitwise_binary_shape,
+	('^',  2): _bitwise_binary_shape,
+	('|',  2): _bitwise_binary_shape,
+	('<<', 2): _shift_left_shape,
+	('>>', 2): _shift_right_shape,
+
+	('m',  3): lambda s, a, b: _bitwise_binary_shape(a, b),
+}
+
+
+def _const_mask(value: 'Value') -> int:
+	return value._as_const() & ((1 << len(value)) - 1)
+
+# Maps (operator, number of operands) to a function evaluating it on constant operands, this must
+# agree with the operator semantics used by the simulator
+_OPERATOR_CONSTS = {
+	('+',  1): lambda a: a._as_const(),
+	('~',  1): lambda a: ~a._as_const(),
+	('-',  1): lambda a: -a._as_const(),
+	('b',  1): lambda a: int(_const_mask(a) != 0),
+	('r|', 1): lambda a: int(_const_mask(a) != 0),
+	('r&', 1): lambda a: int(_const_mask(a) == (1 << len(a)) - 1),
+	('r^', 1): lambda a: format(_const_mask(a), 'b').count('1') % 2,
+	('u',  1): lambda a: a._as_const(),
+	('s',  1): lambda a: a._as_const(),
+
+	('+',  2): lambda a, b: a._as_const() + b._as_const(),
+	('-',  2): lambda a, b: a._as_const() - b._as_const(),
+	('*',  2): lambda a, b: a._as_const() * b._as_const(),
+	('//', 2): lambda a, b: 0 if b._as_const() == 0 else a._as_const() // b._as_const(),
+	('%',  2): lambda a, b: 0 if b._as_const() == 0 else a._as_const() % b._as_const(),
+	('<',  2): lambda a, b: int(a._as_const() < b._as_const()),
+	('<=', 2): lambda a, b: int(a._as_const() <= b._as_const()),
+	('==', 2): lambda a, b: int(a._as_const() == b._as_const()),
+	('!=', 2): lambda a, b: int(a._as_const() != b._as_const()),
+	('>',  2): lambda a, b: int(a._as_const() > b._as_const()),
+	('>=', 2): lambda a, b: int(a._as_const() >= b._as_const()),
+	('&',  2): lambda a, b: a._as_const() & b._as_const(),
+	('^',  2): lambda a, b: a._as_const() ^ b._as_const(),
+	('|',  2): lambda a, b: a._as_const() | b._as_const(),
+	('<<', 2): lambda a, b: a._as_const() << b._as_const(),
+	('>>', 2): lambda a, b: a._as_const() >> b._as_const(),
+
+	('m',  3): lambda s, a, b: a._as_const() if _const_mask(s) else b._as_const(),
+}
+
+
+def _fold_const(value: 'Value') -> 'Value':
+	'''Evaluate an ``Operator`` with only constant operands into a ``Const``, other values are returned as-is.'''
+	if type(value) is Operator:
+		try:
+			return Const(value._as_const(), value.shape())
+		except TypeError:
+			pass
+	return value
+
+
 @final
 class Operator(Value):
+	__slots__ = ('operator', 'operands', '_shape', '_value_key_hash')
+
 	def __init__(self, operator, operands , *, src_loc_at = 0) -> None:
 		super().__init__(src_loc_at = 1 + src_loc_at)
 		self.operator = operator
-		self.operands = [Value.cast(op) for op in operands]
+		self.operands = [op if type(op) in _VALUE_CLASSES else Value.cast(op) for op in operands]
 
+	@_cached_shape
 	def shape(self):
-		def _bitwise_binary_shape(a_shape, b_shape):
-			a_bits, a_sign = a_shape
-			b_bits, b_sign = b_shape
-			if not a_sign and not b_sign:
-				# both operands unsigned
-				return Shape(max(a_bits, b_bits), False)
-			elif a_sign and b_sign:
-				# both operands signed
-				return Shape(max(a_bits, b_bits), True)
-			elif not a_sign and b_sign:
-				# first operand unsigned (add sign bit), second operand signed
-				return Shape(max(a_bits + 1, b_bits), True)
-			else:
-				# first signed, second operand unsigned (add sign bit)
-				return Shape(max(a_bits, b_bits + 1), True)
-
-		op_shapes = list(map(lambda x: x.shape(), self.operands))
-		if len(op_shapes) == 1:
-			(a_width, a_signed), = op_shapes
-			if self.operator in ('+', '~'):
-				return Shape(a_width, a_signed)
-			if self.operator == '-':
-				return Shape(a_width + 1, True)
-			if self.operator in ('b', 'r|', 'r&', 'r^'):
-				return Shape(1, False)
-			if self.operator == 'u':
-				return Shape(a_width, False)
-			if self.operator == 's':
-				return Shape(a_width, True)
-		elif len(op_shapes) == 2:
-			(a_width, a_signed), (b_width, b_signed) = op_shapes
-			if self.operator in ('+', '-'):
-				width, signed = _bitwise_binary_shape(*op_shapes)
-				return Shape(width + 1, signed)
-			if self.operator == '*':
-				return Shape(a_width + b_width, a_signed or b_signed)
-			if self.operator == '//':
-				return Shape(a_width + b_signed, a_signed or b_signed)
-			if self.operator == '%':
-				return Shape(b_width, b_signed)
-			if self.operator in ('<', '<=', '==', '!=', '>', '>='):
-				return Shape(1, False)
-			if self.operator in ('&', '^', '|'):
-				return _bitwise_binary_shape(*op_shapes)
-			if self.operator == '<<':
-				assert not b_signed
-				return Shape(a_width + 2 ** b_width - 1, a_signed)
-			if self.operator == '>>':
-				assert not b_signed
-				return Shape(a_width, a_signed)
-		elif len(op_shapes) == 3:
-			if self.operator == 'm':
-				s_shape, a_shape, b_shape = op_shapes
-				return _bitwise_binary_shape(a_shape, b_shape)
-		raise NotImplementedError(f'Operator {self.operator}/{len(op_shapes)} not implemented') # :nocov:
+		op_shapes = [op.shape() for op in self.operands]
+		handler = _OPERATOR_SHAPES.get((self.operator, len(op_shapes)))
+		if handler is None:
+			raise NotImplementedError(f'Operator {self.operator}/{len(op_shapes)} not implemented') # :nocov:
+		return handler(*op_shapes)
+
+	def _as_const(self) -> int:
+		handler = _OPERATOR_CONSTS.get((self.operator, len(self.operands)))
+		# Very wide results (e.g. from shifts by a wide amount) are impractical to evaluate
+		if handler is None or len(self) > 2 ** 16:
+			return super()._as_const()
+		return Const.normalize(handler(*self.operands), self.shape())
 
 	def _lhs_signals(self):
 		if self.operator in ('u', 's'):
-			return union(op._lhs_signals() for op in self.operands)
+			signals = SignalSet()
+			for op in self.operands:
+				signals.update(op._lhs_signals())
+			return signals
 		return super()._lhs_signals()
 
 	def _rhs_signals(self):
-		return union(op._rhs_signals() for op in self.operands)
+		signals = SignalSet()
+		for op in self.operands:
+			signals.update(op._rhs_signals())
+		return signals
 
 	def __repr__(self):
 		return f'({self.operator} {" ".join(map(repr, self.operands))})'
@@ -796,6 +1071,8 @@ def Mux(sel: Value, val1: Value, val0: Value) -> Operator:
 
 @final
 class Slice(Value):
+	__slots__ = ('value', 'start', 'stop', '_shape', '_value_key_hash')
+
 	def __init__(
 		self, value: ValueCastType, start: int, stop: int, *, src_loc_at: int = 0
 	) -> None:
@@ -821,9 +1098,13 @@ class Slice(Value):
 		self.start = int(start)
 		self.stop  = int(stop)
 
+	@_cached_shape
 	def shape(self) -> Shape:
 		return Shape(self.stop - self.start)
 
+	def __len__(self) -> int:
+		return self.stop - self.start
+
 	def _lhs_signals(self):
 		return self.value._lhs_signals()
 
@@ -836,6 +1117,8 @@ class Slice(Value):
 
 @final
 class Part(Value):
+	__slots__ = ('value', 'offset', 'width', 'stride', '_shape', '_value_key_hash')
+
 	def __init__(
 		self, value: Value, offset: ValueCastType, width: int, stride: int = 1, *,
 		src_loc_at: int = 0
@@ -851,14 +1134,21 @@ class Part(Value):
 		self.width  = width
 		self.stride = stride
 
+	@_cached_shape
 	def shape(self) -> Shape:
 		return Shape(self.width)
 
+	def __len__(self) -> int:
+		return self.width
+
 	def _lhs_signals(self):
 		return self.value._lhs_signals()
 
 	def _rhs_signals(self):
-		return self.value._rhs_signals() | self.offset._rhs_signals()
+		signals = SignalSet()
+		signals.update(self.value._rhs_signals())
+		signals.update(self.offset._rhs_signals())
+		return signals
 
 	def __repr__(self) -> str:
 		return f'(part {repr(self.value)} {repr(self.offset)} {self.width} {self.stride})'
@@ -889,9 +1179,11 @@ class Cat(Value):
 	Value, inout
 		Resulting ``Value`` obtained by concatentation.
 	'''
-	def __init__(self, *args: Iterable[Value], src_loc_at: int = 0) -> None:
-		super().__init__(src_loc_at = src_loc_at)
-		self.parts = []
+
+	__slots__ = ('parts', '_shape', '_value_key_hash')
+
+	def __new__(cls, *args: Iterable[Value], src_loc_at: int = 0) -> Value:
+		parts = []
 		for index, arg in enumerate(flatten(args)):
 			if isinstance(arg, int) and arg not in [0, 1]:
 				warnings.warn(
@@ -899,22 +1191,50 @@ class Cat(Value):
 					f'context; consider specifying explicit width using Const({arg}, {bits_for(arg)}) instead',
 					SyntaxWarning, stacklevel = 2 + src_loc_at
 				)
-			self.parts.append(Value.cast(arg))
+			arg = Value.cast(arg)
+			# Nested concatenations are inlined, this has identical semantics but keeps the tree shallow
+			if type(arg) is Cat:
+				parts.extend(arg.parts)
+			else:
+				parts.append(arg)
+
+		# A concatenation of a single unsigned value is that value, user values are left wrapped so that
+		# they are not lowered before they have to be
+		if len(parts) == 1 and type(parts[0]) in _VALUE_CLASSES and not parts[0].shape().signed:
+			return parts[0]
+
+		self = super().__new__(cls)
+		Value.__init__(self, src_loc_at = src_loc_at)
+		self.parts = parts
+		return self
+
+	def __init__(self, *args: Iterable[Value], src_loc_at: int = 0) -> None:
+		# Everything is done in __new__, as the arguments may be single-use iterators.
+		pass
 
+	@_cached_shape
 	def shape(self) -> Shape:
 		return Shape(sum(len(part) for part in self.parts))
 
 	def _lhs_signals(self):
-		return union((part._lhs_signals() for part in self.parts), start = SignalSet())
+		signals = SignalSet()
+		for part in self.parts:
+			signals.update(part._lhs_signals())
+		return signals
 
 	def _rhs_signals(self):
-		return union((part._rhs_signals() for part in self.parts), start = SignalSet())
+		signals = SignalSet()
+		for part in self.parts:
+			signals.update(part._rhs_signals())
+		return signals
 
 	def _as_const(self) -> int:
-		value = 0
-		for part in reversed(self.parts):
-			value <<= len(part)
-			value |= part._as_const()
+		value  = 0
+		offset = 0
+		for part in self.parts:
+			width   = len(part)
+			value  |= (part._as_const() & ((1 << width) - 1)) << offset
+			offset += width
 		return value
 
 	def __repr__(self) -> str:
@@ -942,20 +1262,41 @@ class Repl(Value):
 	Repl, out
 		Replicated value.
 	'''
-	def __init__(self, value: Value, count: int, *, src_loc_at: int = 0) -> None:
+
+	__slots__ = ('value', 'count', '_shape')
+
+	def __new__(cls, value: Value, count: int, *, src_loc_at: int = 0) -> Value:
 		if not isinstance(count, int) or count < 0:
 			raise TypeError(f'Replication count must be a non-negative integer, not {count!r}')
 
-		super().__init__(src_loc_at = src_loc_at)
 		if isinstance(value, int) and value not in [0, 1]:
 			warnings.warn(
 				f'Value argument of Repl() is a bare integer {value} used in bit vector '
 				f'context; consider specifying explicit width using Const({value}, {bits_for(value)}) instead',
 				SyntaxWarning, stacklevel = 2 + src_loc_at
 			)
-		self.value = Value.cast(value)
+		value = Value.cast(value)
+
+		# Trivial replications do not need a node of their own
+		if count == 0:
+			return Const(0, 0)
+		if count == 1 and type(value) in _VALUE_CLASSES and not value.shape().signed:
+			return value
+
+		self = super().__new__(cls)
+		Value.__init__(self, src_loc_at = src_loc_at)
+		self.value = value
 		self.count = count
+		return self
 
+	def __init__(self, value: Value, count: int, *, src_loc_at: int = 0) -> None:
+		# Everything is done in __new__, so that trivial replications can be short-circuited.
+		pass
+
+	def __reduce__(self):
+		return (Repl, (self.value, self.count), (None, {'src_loc': self.src_loc}))
+
+	@_cached_shape
 	def shape(self) -> Shape:
 		return Shape(len(self.value) * self.count)
 
@@ -1008,6 +1349,11 @@ class Signal(Value, DUID):
 	decoder : function
 	'''
 
+	__slots__ = (
+		'name', '_width', '_signed', 'reset', 'reset_less', 'attrs', 'decoder', '_enum_class', 'duid',
+		'_signal_intern',
+	)
+
 	def __init__(
 		self, shape = None, *, name = None, reset = 0, reset_less = False,
 		attrs = None, decoder = None, src_loc_at = 0
@@ -1020,25 +1366,26 @@ class Signal(Value, DUID):
 
 		if shape is None:
 			shape = unsigned(1)
-		self.width, self.signed = Shape.cast(shape, src_loc_at = 1 + src_loc_at)
+		self._width, self._signed = Shape.cast(shape, src_loc_at = 1 + src_loc_at)
 
 		if isinstance(reset, Enum):
 			reset = reset.value
 		if not isinstance(reset, int):
 			raise TypeError('Reset value has to be an int or an integral Enum')
 
-		reset_width = bits_for(reset, self.signed)
-		if reset != 0 and reset_width > self.width:
-			warnings.warn(
-				f'Reset value {reset!r} requires {reset_width} bits to represent, '
-				f'but the signal only has {self.width} bits',
-				SyntaxWarning, stacklevel = 2 + src_loc_at
-			)
+		if reset:
+			reset_width = bits_for(reset, self.signed)
+			if reset_width > self.width:
+				warnings.warn(
+					f'Reset value {reset!r} requires {reset_width} bits to represent, '
+					f'but the signal only has {self.width} bits',
+					SyntaxWarning, stacklevel = 2 + src_loc_at
+				)
 
 		self.reset = reset
 		self.reset_less = bool(reset_less)
 
-		self.attrs = OrderedDict(() if attrs is None else attrs)
+		self.attrs = dict(() if attrs is None else attrs)
 
 		if decoder is None and isinstance(shape, type) and issubclass(shape, Enum):
 			decoder = shape
@@ -1079,8 +1426,31 @@ class Signal(Value, DUID):
 		kw.update(kwargs)
 		return Signal(**kw, src_loc_at = 1 + src_loc_at)
 
+	@property
+	def width(self) -> int:
+		return self._width
+
+	@width.setter
+	def width(self, width: int) -> None:
+		global _shape_generation
+		self._width = width
+		_shape_generation += 1
+
+	@property
+	def signed(self) -> bool:
+		return self._signed
+
+	@signed.setter
+	def signed(self, signed: bool) -> None:
+		global _shape_generation
+		self._signed = signed
+		_shape_generation += 1
+
 	def shape(self):
-		return Shape(self.width, self.signed)
+		return Shape(self._width, self._signed)
+
+	def __len__(self):
+		return self._width
 
 	def _lhs_signals(self):
 		return SignalSet((self,))
@@ -1105,6 +1475,9 @@ class ClockSignal(Value):
 	domain : str
 		Clock domain to obtain a clock signal for. Defaults to ``'sync'``.
 	'''
+
+	__slots__ = ('domain', '_signal_intern', '_repr')
+
 	def __init__(self, domain = 'sync', *, src_loc_at = 0):
 		super().__init__(src_loc_at = src_loc_at)
 		if not isinstance(domain, str):
@@ -1123,7 +1496,11 @@ class ClockSignal(Value):
 		raise NotImplementedError('ClockSignal must be lowered to a concrete signal') # :nocov:
 
 	def __repr__(self):
-		return f'(clk {self.domain})'
+		try:
+			return self._repr
+		except AttributeError:
+			self._repr = f'(clk {self.domain})'
+			return self._repr
 
 
 @final
@@ -1141,6 +1518,9 @@ class ResetSignal(Value):
 	allow_reset_less : bool
 		If the clock domain is reset-less, act as a constant ``0`` instead of reporting an error.
 	'''
+
+	__slots__ = ('domain', 'allow_reset_less', '_signal_intern', '_repr')
+
 	def __init__(self, domain: str = 'sync', allow_reset_less: bool = False, *, src_loc_at: int = 0):
 		super().__init__(src_loc_at = src_loc_at)
 		if not isinstance(domain, str):
@@ -1160,7 +1540,11 @@ class ResetSignal(Value):
 		raise NotImplementedError('ResetSignal must be lowered to a concrete signal') # :nocov:
 
 	def __repr__(self) -> str:
-		return f'(rst {self.domain})'
+		try:
+			return self._repr
+		except AttributeError:
+			self._repr = f'(rst {self.domain})'
+			return self._repr
 
 
 class Array(MutableSequence):
@@ -1251,10 +1635,17 @@ class Array(MutableSequence):
 
 @final
 class ArrayProxy(Value):
+	__slots__ = ('elems', 'index', '_cast_elems', '_lhs_cache', '_rhs_cache', '_value_key_hash')
+
 	def __init__(self, elems, index, *, src_loc_at=0):
 		super().__init__(src_loc_at = 1 + src_loc_at)
 		self.elems = elems
 		self.index = Value.cast(index)
+		# Unset slots would be forwarded to the elements by `__getattr__`, so caches start out as `None`
+		self._cast_elems     = None
+		self._value_key_hash = None
+		self._lhs_cache      = None
+		self._rhs_cache      = None
 
 	def __getattr__(self, attr):
 		return ArrayProxy([getattr(elem, attr) for elem in self.elems], self.index)
@@ -1263,7 +1654,11 @@ class ArrayProxy(Value):
 		return ArrayProxy([        elem[index] for elem in self.elems], self.index)
 
 	def _iter_as_values(self):
-		return (Value.cast(elem) for elem in self.elems)
+		# Elements may be arbitrary objects that are only indexed into (e.g. via ``__getattr__``),
+		# so they are cast on first use rather than at construction, and only once.
+		if self._cast_elems is None:
+			self._cast_elems = tuple(Value.cast(elem) for elem in self.elems)
+		return iter(self._cast_elems)
 
 	def shape(self):
 		unsigned_width = signed_width = 0
@@ -1288,15 +1683,30 @@ class ArrayProxy(Value):
 			# are zero-extended.
 			return Shape(max(unsigned_width, signed_width), has_signed)
 
+	# The array is frozen once proxied, so the signal sets of all of its elements are only
+	# collected once. Callers may modify the returned sets, so each call gets a copy.
 	def _lhs_signals(self):
-		signals = union((elem._lhs_signals() for elem in self._iter_as_values()),
-						start = SignalSet())
+		cached = self._lhs_cache
+		if cached is None:
+			cached = SignalSet()
+			for elem in self._iter_as_values():
+				cached.update(elem._lhs_signals())
+			self._lhs_cache = cached
+		signals = SignalSet()
+		signals.update(cached)
 		return signals
 
 	def _rhs_signals(self):
-		signals = union((elem._rhs_signals() for elem in self._iter_as_values()),
-						start = SignalSet())
-		return self.index._rhs_signals() | signals
+		cached = self._rhs_cache
+		if cached is None:
+			cached = SignalSet()
+			cached.update(self.index._rhs_signals())
+			for elem in self._iter_as_values():
+				cached.update(elem._rhs_signals())
+			self._rhs_cache = cached
+		signals = SignalSet()
+		signals.update(cached)
+		return signals
 
 	def __repr__(self):
 		return f'(proxy (array [{", ".join(map(repr, self.elems))}]) {self.index!r})'
@@ -1371,14 +1781,16 @@ class ValueCastable:
 	in a way that changes its representation after the first call to :meth:`as_value`.
 	'''
 	def __new__(cls, *args, **kwargs):
-		self = super().__new__(cls)
-		if not hasattr(self, 'as_value'):
-			raise TypeError(f'Class \'{cls.__name__}\' deriving from `ValueCastable` must override '
-							'the `as_value` method')
-		if not hasattr(self.as_value, '_ValueCastable__memoized'):
-			raise TypeError(f'Class \'{cls.__name__}\' deriving from `ValueCastable` must decorate '
-							'the `as_value` method with the `ValueCastable.lowermethod` decorator')
-		return self
+		# The checks only depend on the class, so only the first instantiation of each class pays for them
+		if '_ValueCastable__checked' not in cls.__dict__:
+			if not hasattr(cls, 'as_value'):
+				raise TypeError(f'Class \'{cls.__name__}\' deriving from `ValueCastable` must override '
+								'the `as_value` method')
+			if not hasattr(cls.as_value, '_ValueCastable__memoized'):
+				raise TypeError(f'Class \'{cls.__name__}\' deriving from `ValueCastable` must decorate '
+								'the `as_value` method with the `ValueCastable.lowermethod` decorator')
+			cls.__checked = True
+		return super().__new__(cls)
 
 	@staticmethod
 	def lowermethod(func):
@@ -1410,6 +1822,9 @@ class Sample(Value):
 	of the ``domain`` clock back. If that moment is before the beginning of time, it is equal
 	to the value of the expression calculated as if each signal had its reset value.
 	'''
+
+	__slots__ = ('value', 'clocks', 'domain', '_value_key_hash')
+
 	def __init__(self, expr, clocks, domain, *, src_loc_at = 0):
 		super().__init__(src_loc_at = 1 + src_loc_at)
 		self.value  = Value.cast(expr)
@@ -1454,8 +1869,22 @@ class Initial(Value):
 
 	An ``Initial`` signal is ``1`` at the first cycle of model checking, and ``0`` at any other.
 	'''
+
+	__slots__ = ()
+
+	_instance = None
+
+	def __new__(cls, *, src_loc_at = 0):
+		self = cls._instance
+		if self is None:
+			# Like interned constants, the shared instance carries no source location.
+			self = super().__new__(cls)
+			self.src_loc = None
+			cls._instance = self
+		return self
+
 	def __init__(self, *, src_loc_at = 0):
-		super().__init__(src_loc_at = src_loc_at)
+		pass
 
 	def shape(self):
 		return Shape(1)
@@ -1467,32 +1896,65 @@ class Initial(Value):
 		return '(initial)'
 
 
+# Exact-type fast path for `Value.cast`, subclasses and castable objects go through the full cast.
+_VALUE_CAST_DISPATCH = {
+	int:  Const,
+	bool: Const,
+	**{
+		cls: _cast_identity for cls in (
+			Const, AnyConst, AnySeq, Operator, Slice, Part, Cat, Repl,
+			Signal, ClockSignal, ResetSignal, ArrayProxy, Sample, Initial,
+		)
+	}
+}
+
+_VALUE_CLASSES = frozenset(
+	cls for cls, handler in _VALUE_CAST_DISPATCH.items() if handler is _cast_identity
+)
+
+
 class _StatementList(list):
 	def __repr__(self):
 		return f'({" ".join(map(repr, self))})'
 
 
 class Statement:
+	# Fragments and the DSL mark every statement they are given as used, not just properties
+	__slots__ = ('src_loc', '_MustUse__used', '__weakref__')
+
 	def __init__(self, *, src_loc_at = 0):
-		self.src_loc = tracer.get_src_loc(1 + src_loc_at)
+		self.src_loc = tracer.get_src_loc(1 + src_loc_at) if _SRC_LOC_ENABLED else None
 
 	@staticmethod
 	def cast(obj):
-		if isinstance(obj, Iterable):
-			return _StatementList(list(chain.from_iterable(map(Statement.cast, obj))))
-		else:
-			if isinstance(obj, Statement):
-				return _StatementList([obj])
+		if isinstance(obj, Statement):
+			return _StatementList([obj])
+
+		stmts = _StatementList()
+		stack = [iter((obj,))]
+		while stack:
+			for item in stack[-1]:
+				if isinstance(item, Statement):
+					stmts.append(item)
+				elif isinstance(item, Iterable) and not isinstance(item, (str, bytes)):
+					stack.append(iter(item))
+					break
+				else:
+					raise TypeError(f'Object {item!r} is not an Torii statement')
 			else:
-				raise TypeError(f'Object {obj!r} is not an Torii statement')
+				stack.pop()
+		return stmts
 
 
 @final
 class Assign(Statement):
+	__slots__ = ('lhs', 'rhs')
+
 	def __init__(self, lhs, rhs, *, src_loc_at = 0):
-		super().__init__(src_loc_at = src_loc_at)
-		self.lhs = Value.cast(lhs)
-		self.rhs = Value.cast(rhs)
+		# Inlined `Statement.__init__`, this is the most frequently constructed statement
+		self.src_loc = tracer.get_src_loc(src_loc_at) if _SRC_LOC_ENABLED else None
+		self.lhs     = Value.cast(lhs)
+		self.rhs     = Value.cast(rhs)
 
 	def _lhs_signals(self):
 		return self.lhs._lhs_signals()
@@ -1509,6 +1971,8 @@ class UnusedProperty(UnusedMustUse):
 
 
 class Property(Statement, MustUse):
+	__slots__ = ('test', '_check', '_en')
+
 	_MustUse__warning = UnusedProperty
 
 	def __init__(
@@ -1550,8 +2014,16 @@ class Cover(Property):
 	_kind = 'cover'
 
 
+@functools.lru_cache(maxsize = 4096)
+def _switch_key(value: int, width: int) -> str:
+	'''Format an integer switch key as a ``width``-bit binary pattern.'''
+	return f'{value & ((1 << width) - 1):0{width}b}'
+
+
 # @final
 class Switch(Statement):
+	__slots__ = ('test', 'cases', 'case_src_locs')
+
 	def __init__(self, test, cases, *, src_loc = None, src_loc_at = 0, case_src_locs = {}):
 		if src_loc is None:
 			super().__init__(src_loc_at = src_loc_at)
@@ -1564,7 +2036,8 @@ class Switch(Statement):
 		self.case_src_locs = {}
 
 		self.test  = Value.cast(test)
-		self.cases = OrderedDict()
+		self.cases = {}
+		width = len(self.test)
 		for orig_keys, stmts in cases.items():
 			# Map: None -> (); key -> (key,); (key...) -> (key...)
 			keys = orig_keys
@@ -1573,19 +2046,19 @@ class Switch(Statement):
 			if not isinstance(keys, tuple):
 				keys = (keys,)
 			# Map: 2 -> "0010"; "0010" -> "0010"
-			new_keys = ()
-			key_mask = (1 << len(self.test)) - 1
+			new_keys = []
 			for key in keys:
 				if isinstance(key, str):
 					key = "".join(key.split()) # remove whitespace
 				elif isinstance(key, int):
-					key = format(key & key_mask, 'b').rjust(len(self.test), '0')
+					key = _switch_key(key, width)
 				elif isinstance(key, Enum):
-					key = format(key.value & key_mask, 'b').rjust(len(self.test), '0')
+					key = _switch_key(key.value, width)
 				else:
 					raise TypeError(f'Object {key!r} cannot be used as a switch key')
-				assert len(key) == len(self.test)
-				new_keys = (*new_keys, key)
+				assert len(key) == width
+				new_keys.append(key)
+			new_keys = tuple(new_keys)
 			if not isinstance(stmts, Iterable):
 				stmts = [stmts]
 			self.cases[new_keys] = Statement.cast(stmts)
@@ -1593,14 +2066,19 @@ class Switch(Statement):
 				self.case_src_locs[new_keys] = case_src_locs[orig_keys]
 
 	def _lhs_signals(self):
-		signals = union((s._lhs_signals() for ss in self.cases.values() for s in ss),
-						start = SignalSet())
+		signals = SignalSet()
+		for stmts in self.cases.values():
+			for stmt in stmts:
+				signals.update(stmt._lhs_signals())
 		return signals
 
 	def _rhs_signals(self):
-		signals = union((s._rhs_signals() for ss in self.cases.values() for s in ss),
-						start = SignalSet())
-		return self.test._rhs_signals() | signals
+		signals = SignalSet()
+		signals.update(self.test._rhs_signals())
+		for stmts in self.cases.values():
+			for stmt in stmts:
+				signals.update(stmt._rhs_signals())
+		return signals
 
 	def __repr__(self) -> str:
 		def case_repr(keys, stmts):
@@ -1627,7 +2105,7 @@ class _MappedKeyCollection(metaclass = ABCMeta):
 
 class _MappedKeyDict(MutableMapping, _MappedKeyCollection):
 	def __init__(self, pairs = ()):
-		self._storage = OrderedDict()
+		self._storage = {}
 		for key, value in pairs:
 			self[key] = value
 
@@ -1653,14 +2131,7 @@ class _MappedKeyDict(MutableMapping, _MappedKeyCollection):
 	def __eq__(self, other):
 		if not isinstance(other, type(self)):
 			return False
-		if len(self) != len(other):
-			return False
-		for ak, bk in zip(sorted(self._storage), sorted(other._storage)):
-			if ak != bk:
-				return False
-			if self._storage[ak] != other._storage[bk]:
-				return False
-		return True
+		return self._storage == other._storage
 
 	def __len__(self):
 		return len(self._storage)
@@ -1672,7 +2143,7 @@ class _MappedKeyDict(MutableMapping, _MappedKeyCollection):
 
 class _MappedKeySet(MutableSet, _MappedKeyCollection):
 	def __init__(self, elements = ()) -> None:
-		self._storage = OrderedDict()
+		self._storage = {}
 		for elem in elements:
 			self.add(elem)
 
@@ -1680,8 +2151,16 @@ class _MappedKeySet(MutableSet, _MappedKeyCollection):
 		self._storage[self._map_key(value)] = None
 
 	def update(self, values) -> None:
-		for value in values:
-			self.add(value)
+		if type(values) is type(self):
+			# The keys are already mapped, so they can be merged directly
+			self._storage.update(values._storage)
+		else:
+			for value in values:
+				self.add(value)
+
+	def __ior__(self, values):
+		self.update(values)
+		return self
 
 	def discard(self, value) -> None:
 		if value in self:
@@ -1701,40 +2180,84 @@ class _MappedKeySet(MutableSet, _MappedKeyCollection):
 		return f'{type(self).__module__}.{type(self).__name__}({", ".join(repr(x) for x in self)})'
 
 
+def _cache_value_key_hash(compute):
+	'''Memoize the ``ValueKey`` hash of a compound value, so shared subtrees are only walked once.'''
+	def handler(value):
+		result = getattr(value, '_value_key_hash', None)
+		if result is None:
+			value._value_key_hash = result = compute(value)
+		return result
+	return handler
+
+
+_VALUE_KEY_HASH = {
+	Const:       lambda v: hash(v.value),
+	Signal:      lambda v: hash(v.duid),
+	AnyValue:    lambda v: hash(v.duid),
+	ClockSignal: lambda v: hash(v.domain),
+	ResetSignal: lambda v: hash(v.domain),
+	Operator:    _cache_value_key_hash(lambda v: hash((v.operator, tuple(ValueKey(o) for o in v.operands)))),
+	Slice:       _cache_value_key_hash(lambda v: hash((ValueKey(v.value), v.start, v.stop))),
+	Part:        _cache_value_key_hash(lambda v: hash((ValueKey(v.value), ValueKey(v.offset), v.width, v.stride))),
+	Cat:         _cache_value_key_hash(lambda v: hash(tuple(ValueKey(o) for o in v.parts))),
+	ArrayProxy:  _cache_value_key_hash(
+		lambda v: hash((ValueKey(v.index), tuple(ValueKey(e) for e in v._iter_as_values())))
+	),
+	Sample:      _cache_value_key_hash(lambda v: hash((ValueKey(v.value), v.clocks, v.domain))),
+	Initial:     lambda v: 0,
+}
+
+_VALUE_KEY_EQ = {
+	Const:       lambda a, b: a.value == b.value,
+	Signal:      lambda a, b: a is b,
+	AnyValue:    lambda a, b: a is b,
+	ClockSignal: lambda a, b: a.domain == b.domain,
+	ResetSignal: lambda a, b: a.domain == b.domain,
+	Operator:    lambda a, b: (
+		a.operator == b.operator and len(a.operands) == len(b.operands) and
+		all(ValueKey(x) == ValueKey(y) for x, y in zip(a.operands, b.operands))
+	),
+	Slice:       lambda a, b: ValueKey(a.value) == ValueKey(b.value) and a.start == b.start and a.stop == b.stop,
+	Part:        lambda a, b: (
+		ValueKey(a.value) == ValueKey(b.value) and ValueKey(a.offset) == ValueKey(b.offset) and
+		a.width == b.width and a.stride == b.stride
+	),
+	Cat:         lambda a, b: all(ValueKey(x) == ValueKey(y) for x, y in zip(a.parts, b.parts)),
+	ArrayProxy:  lambda a, b: (
+		ValueKey(a.index) == ValueKey(b.index) and len(a.elems) == len(b.elems) and
+		all(ValueKey(x) == ValueKey(y) for x, y in zip(a._iter_as_values(), b._iter_as_values()))
+	),
+	Sample:      lambda a, b: (
+		ValueKey(a.value) == ValueKey(b.value) and a.clocks == b.clocks and a.domain == b.domain
+	),
+	Initial:     lambda a, b: True,
+}
+
+_VALUE_KEY_SORT = {
+	Signal:   lambda v: (0, v.duid),
+	AnyValue: lambda v: (0, v.duid),
+	Const:    lambda v: (1, v.value, v.width, v.signed),
+	Slice:    lambda v: (2, _value_key_handler(_VALUE_KEY_SORT, v.value)(v.value), v.start, v.stop),
+}
+
+def _value_key_handler(table: dict, value: Value):
+	'''Look up the handler for ``value`` in a ``ValueKey`` dispatch table, including subclasses.'''
+	cls = type(value)
+	handler = table.get(cls)
+	if handler is None:
+		for base in cls.__mro__[1:]:
+			if base in table:
+				handler = table[cls] = table[base]
+				break
+		else: # :nocov:
+			raise TypeError(f'Object {value!r} cannot be used as a key in value collections')
+	return handler
+
+
 class ValueKey:
 	def __init__(self, value: ValueCastType) -> None:
 		self.value = Value.cast(value)
-		if isinstance(self.value, Const):
-			self._hash = hash(self.value.value)
-		elif isinstance(self.value, (Signal, AnyValue)):
-			self._hash = hash(self.value.duid)
-		elif isinstance(self.value, (ClockSignal, ResetSignal)):
-			self._hash = hash(self.value.domain)
-		elif isinstance(self.value, Operator):
-			self._hash = hash((
-				self.value.operator,
-				tuple(ValueKey(o) for o in self.value.operands)
-			))
-		elif isinstance(self.value, Slice):
-			self._hash = hash((ValueKey(self.value.value), self.value.start, self.value.stop))
-		elif isinstance(self.value, Part):
-			self._hash = hash((
-				ValueKey(self.value.value), ValueKey(self.value.offset),
-				self.value.width, self.value.stride
-			))
-		elif isinstance(self.value, Cat):
-			self._hash = hash(tuple(ValueKey(o) for o in self.value.parts))
-		elif isinstance(self.value, ArrayProxy):
-			self._hash = hash((
-				ValueKey(self.value.index),
-				tuple(ValueKey(e) for e in self.value._iter_as_values())
-			))
-		elif isinstance(self.value, Sample):
-			self._hash = hash((ValueKey(self.value.value), self.value.clocks, self.value.domain))
-		elif isinstance(self.value, Initial):
-			self._hash = 0
-		else: # :nocov:
-			raise TypeError(f'Object {self.value!r} cannot be used as a key in value collections')
+		self._hash = _value_key_handler(_VALUE_KEY_HASH, self.value)(self.value)
 
 	def __hash__(self) -> int:
 		return self._hash
@@ -1742,63 +2265,28 @@ class ValueKey:
 	def __eq__(self, other: 'ValueKey'):
 		if not isinstance(other, ValueKey):
 			return False
-		if not isinstance(self.value, type(other.value)):
+		value = self.value
+		# Signals are by far the most common keys, and are compared by identity
+		if type(value) is Signal:
+			return value is other.value
+		if value is other.value:
+			return True
+		if not isinstance(value, type(other.value)):
 			return False
 
-		if isinstance(self.value, Const):
-			return self.value.value == other.value.value
-		elif isinstance(self.value, (Signal, AnyValue)):
-			return self.value is other.value
-		elif isinstance(self.value, (ClockSignal, ResetSignal)):
-			return self.value.domain == other.value.domain
-		elif isinstance(self.value, Operator):
-			return (self.value.operator == other.value.operator and
-					len(self.value.operands) == len(other.value.operands) and
-					all(ValueKey(a) == ValueKey(b)
-						for a, b in zip(self.value.operands, other.value.operands)))
-		elif isinstance(self.value, Slice):
-			return (ValueKey(self.value.value) == ValueKey(other.value.value) and
-					self.value.start == other.value.start and
-					self.value.stop == other.value.stop)
-		elif isinstance(self.value, Part):
-			return (ValueKey(self.value.value) == ValueKey(other.value.value) and
-					ValueKey(self.value.offset) == ValueKey(other.value.offset) and
-					self.value.width == other.value.width and
-					self.value.stride == other.value.stride)
-		elif isinstance(self.value, Cat):
-			return all(ValueKey(a) == ValueKey(b)
-						for a, b in zip(self.value.parts, other.value.parts))
-		elif isinstance(self.value, ArrayProxy):
-			return (ValueKey(self.value.index) == ValueKey(other.value.index) and
-					len(self.value.elems) == len(other.value.elems) and
-					all(ValueKey(a) == ValueKey(b)
-						for a, b in zip(self.value._iter_as_values(),
-										other.value._iter_as_values())))
-		elif isinstance(self.value, Sample):
-			return (ValueKey(self.value.value) == ValueKey(other.value.value) and
-					self.value.clocks == other.value.clocks and
-					self.value.domain == self.value.domain)
-		elif isinstance(self.value, Initial):
-			return True
-		else: # :nocov:
-			raise TypeError(f'Object {self.value!r} cannot be used as a key in value collections')
+		return _value_key_handler(_VALUE_KEY_EQ, value)(value, other.value)
+
+	def _sort_key(self) -> tuple:
+		try:
+			return self.__sort_key
+		except AttributeError:
+			self.__sort_key = _value_key_handler(_VALUE_KEY_SORT, self.value)(self.value)
+			return self.__sort_key
 
 	def __lt__(self, other: 'ValueKey') -> bool:
 		if not isinstance(other, ValueKey):
 			return False
-		if not isinstance(self.value, type(other.value)):
-			return False
-
-		if isinstance(self.value, Const):
-			return self.value < other.value
-		elif isinstance(self.value, (Signal, AnyValue)):
-			return self.value.duid < other.value.duid
-		elif isinstance(self.value, Slice):
-			return (ValueKey(self.value.value) < ValueKey(other.value.value) and
-					self.value.start < other.value.start and
-					self.value.end < other.value.end)
-		else: # :nocov:
-			raise TypeError('Object {!r} cannot be used as a key in value collections')
+		return self._sort_key() < other._sort_key()
 
 	def __repr__(self) -> str:
 		return f'<{__name__}.ValueKey {self.value!r}>'
@@ -1819,19 +2307,27 @@ class ValueSet(_MappedKeySet):
 
 
 class SignalKey:
+	__slots__ = ('signal', '_intern', '_hash')
+
 	def __init__(self, signal: Union[Signal, ClockSignal, ResetSignal]) -> None:
 		self.signal = signal
-		if isinstance(signal, Signal):
-			self._intern = (0, signal.duid)
-		elif type(signal) is ClockSignal:
-			self._intern = (1, signal.domain)
-		elif type(signal) is ResetSignal:
-			self._intern = (2, signal.domain)
-		else:
+		if not isinstance(signal, (Signal, ClockSignal, ResetSignal)):
 			raise TypeError(f'Object {signal!r} is not an Torii signal')
+		# The key itself is not kept on the signal, as it refers back to the signal
+		try:
+			self._intern, self._hash = signal._signal_intern
+		except AttributeError:
+			if isinstance(signal, Signal):
+				self._intern = (0, signal.duid)
+			elif isinstance(signal, ClockSignal):
+				self._intern = (1, signal.domain)
+			else:
+				self._intern = (2, signal.domain)
+			self._hash = hash(self._intern)
+			signal._signal_intern = (self._intern, self._hash)
 
 	def __hash__(self) -> int:
-		return hash(self._intern)
+		return self._hash
 
 	def __eq__(self, other: 'SignalKey') -> bool:
 		if type(other) is not SignalKey:
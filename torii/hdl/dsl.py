@@ -9,6 +9,7 @@ from functools    import wraps
 from ..util       import flatten, tracer
 from ..util.units import bits_for
 from .ast         import *
+from .ast         import _PATTERN_INVALID, _PATTERN_WHITESPACE
 from .cd          import *
 from .ir          import *
 from .xfrm        import *
@@ -310,10 +311,10 @@ class Module(_ModuleBuilderRoot, Elaboratable):
 		for pattern in patterns:
 			if not isinstance(pattern, (int, str, Enum)):
 				raise SyntaxError(f'Case pattern must be an integer, a string, or an enumeration, not {pattern!r}')
-			if isinstance(pattern, str) and any(bit not in '01- \t' for bit in pattern):
+			if isinstance(pattern, str) and _PATTERN_INVALID.search(pattern):
 				raise SyntaxError(f'Case pattern \'{pattern}\' must consist of 0, 1, and - (don\'t care) bits, and may include whitespace')
 			if (isinstance(pattern, str) and
-					len("".join(pattern.split())) != len(switch_data['test'])):
+					len(pattern.translate(_PATTERN_WHITESPACE)) != len(switch_data['test'])):
 				raise SyntaxError(f'Case pattern \'{pattern}\' must have the same width as switch value (which is {len(switch_data["test"])})')
 			if isinstance(pattern, int) and bits_for(pattern) > len(switch_data["test"]):
 				warnings.warn(
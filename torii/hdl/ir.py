@@ -72,7 +72,7 @@ class Fragment:
 		self.statements = []
 		self.domains = OrderedDict()
 		self.subfragments = []
-		self.attrs = OrderedDict()
+		self.attrs = {}
 		self.generated = OrderedDict()
 		self.flatten = False
 
@@ -257,7 +257,10 @@ class Fragment:
 				raise DriverConflict(message)
 			elif mode == 'warn':
 				message += '; hierarchy will be flattened'
-				warnings.warn_explicit(message, DriverConflict, *signal.src_loc)
+				if signal.src_loc is None:
+					warnings.warn(message, DriverConflict)
+				else:
+					warnings.warn_explicit(message, DriverConflict, *signal.src_loc)
 
 		for memory, subfrags in memory_subfrags.items():
 			subfrag_names = flatten_subfrags_if_needed(subfrags)
@@ -1,7 +1,6 @@
 # SPDX-License-Identifier: BSD-2-Clause
 
 import operator
-from collections import OrderedDict
 from typing      import Optional
 
 from ..util      import tracer
@@ -45,7 +44,7 @@ class Memory:
 	'''
 	def __init__(
 		self, *, width: int, depth: int, init = None, name: Optional[str] = None,
-		attrs: Optional[OrderedDict] = None, simulate: bool = True
+		attrs: Optional[dict] = None, simulate: bool = True
 	) -> None:
 		if not isinstance(width, int) or width < 0:
 			raise TypeError(f'Memory width must be a non-negative integer, not {width!r}')
@@ -57,7 +56,7 @@ class Memory:
 
 		self.width = width
 		self.depth = depth
-		self.attrs = OrderedDict(() if attrs is None else attrs)
+		self.attrs = dict(() if attrs is None else attrs)
 
 		# Array of signals for simulation.
 		self._array = Array()
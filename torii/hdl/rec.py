@@ -5,7 +5,6 @@ from enum        import Enum
 from functools   import reduce, wraps
 from typing      import Any, Generator, Iterable, Optional, Tuple, Union
 
-from ..util      import union
 from ..util      import tracer
 from .ast        import *
 
@@ -192,10 +191,16 @@ class Record(ValueCastable):
 		return len(self.as_value())
 
 	def _lhs_signals(self):
-		return union((f._lhs_signals() for f in self.fields.values()), start = SignalSet())
+		signals = SignalSet()
+		for field in self.fields.values():
+			signals.update(field._lhs_signals())
+		return signals
 
 	def _rhs_signals(self):
-		return union((f._rhs_signals() for f in self.fields.values()), start = SignalSet())
+		signals = SignalSet()
+		for field in self.fields.values():
+			signals.update(field._rhs_signals())
+		return signals
 
 	def __repr__(self) -> str:
 		fields = []
@@ -24,6 +24,21 @@ __all__ = (
 )
 
 
+def _is_shared_value(value, new_value):
+	'''Whether ``new_value`` may be shared with other trees, and so must keep its own source location.'''
+	if type(new_value) is Const:
+		return new_value._is_interned()
+	if type(new_value) is Initial:
+		return True
+	# A single-part `Cat` or single `Repl` can only exist for a signed operand, if the transformed operand
+	# is unsigned the constructor hands it back as-is instead of building a new node.
+	if type(value) is Cat and type(new_value) is not Cat:
+		return len(value.parts) == 1
+	if type(value) is Repl and type(new_value) is not Repl:
+		return value.count == 1
+	return False
+
+
 class ValueVisitor(metaclass = ABCMeta):
 	@abstractmethod
 	def on_Const(self, value):
@@ -121,7 +136,10 @@ class ValueVisitor(metaclass = ABCMeta):
 			new_value = self.on_value(value._lazy_lower())
 		else:
 			new_value = self.on_unknown_value(value)
-		if isinstance(new_value, Value) and self.replace_value_src_loc(value, new_value):
+		if (
+			isinstance(new_value, Value) and not _is_shared_value(value, new_value) and
+			self.replace_value_src_loc(value, new_value)
+		):
 			new_value.src_loc = value.src_loc
 		return new_value
 
@@ -253,7 +271,7 @@ class StatementTransformer(StatementVisitor):
 		return Cover(self.on_value(stmt.test), _check=stmt._check, _en=stmt._en)
 
 	def on_Switch(self, stmt):
-		cases = OrderedDict((k, self.on_statement(s)) for k, s in stmt.cases.items())
+		cases = {k: self.on_statement(s) for k, s in stmt.cases.items()}
 		return Switch(self.on_value(stmt.test), cases)
 
 	def on_statements(self, stmts):
@@ -298,7 +316,7 @@ class FragmentTransformer:
 		else:
 			new_fragment = Fragment()
 			new_fragment.flatten = fragment.flatten
-		new_fragment.attrs = OrderedDict(fragment.attrs)
+		new_fragment.attrs = dict(fragment.attrs)
 		self.map_ports(fragment, new_fragment)
 		self.map_subfragments(fragment, new_fragment)
 		self.map_domains(fragment, new_fragment)
@@ -614,7 +632,7 @@ class SwitchCleaner(StatementVisitor):
 	on_Cover  = on_ignore
 
 	def on_Switch(self, stmt):
-		cases = OrderedDict((k, self.on_statement(s)) for k, s in stmt.cases.items())
+		cases = {k: self.on_statement(s) for k, s in stmt.cases.items()}
 		if any(len(s) for s in cases.values()):
 			return Switch(stmt.test, cases)
 
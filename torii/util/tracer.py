@@ -2,7 +2,7 @@
 
 from sys    import _getframe, version_info
 from typing import Optional, Tuple, Union
-from opcode import opname
+from opcode import opmap
 
 __all__ = (
 	'NameNotFound',
@@ -15,39 +15,47 @@ class NameNotFound(Exception):
 
 _raise_exception = object()
 
+def _opcodes(*names: str) -> frozenset:
+	return frozenset(opmap[name] for name in names if name in opmap)
+
+_CACHE        = opmap.get('CACHE')
+_EXTENDED_ARG = opmap['EXTENDED_ARG']
+_STORE_NAMES  = _opcodes('STORE_NAME', 'STORE_ATTR')
+_STORE_FAST   = opmap['STORE_FAST']
+_STORE_DEREF  = opmap['STORE_DEREF']
+_CALL_OPCODES = _opcodes('CALL_FUNCTION', 'CALL_FUNCTION_KW', 'CALL_FUNCTION_EX', 'CALL_METHOD', 'CALL')
+_SKIP_OPCODES = _opcodes(
+	'LOAD_GLOBAL', 'LOAD_NAME', 'LOAD_ATTR', 'LOAD_FAST',
+	'LOAD_DEREF', 'DUP_TOP', 'BUILD_LIST', 'CACHE', 'COPY'
+)
+
 def get_var_name(depth: int = 2, default: Optional[Union[str, object]] = _raise_exception) -> Union[str, object]:
 	frame = _getframe(depth)
 	code = frame.f_code
+	co_code = code.co_code
 	call_index = frame.f_lasti
-	while call_index > 0 and opname[code.co_code[call_index]] == 'CACHE':
+	while call_index > 0 and co_code[call_index] == _CACHE:
 		call_index -= 2
-	while True:
-		call_opc = opname[code.co_code[call_index]]
-		if call_opc in ('EXTENDED_ARG',):
-			call_index += 2
-		else:
-			break
-	if call_opc not in ('CALL_FUNCTION', 'CALL_FUNCTION_KW', 'CALL_FUNCTION_EX', 'CALL_METHOD', 'CALL'):
+	while co_code[call_index] == _EXTENDED_ARG:
+		call_index += 2
+	if co_code[call_index] not in _CALL_OPCODES:
 		return None
 
 	index = call_index + 2
 	while True:
-		opc = opname[code.co_code[index]]
-		if opc in ('STORE_NAME', 'STORE_ATTR'):
-			name_index = int(code.co_code[index + 1])
+		opc = co_code[index]
+		if opc in _STORE_NAMES:
+			name_index = co_code[index + 1]
 			return code.co_names[name_index]
-		elif opc == 'STORE_FAST':
-			name_index = int(code.co_code[index + 1])
+		elif opc == _STORE_FAST:
+			name_index = co_code[index + 1]
 			return code.co_varnames[name_index]
-		elif opc == 'STORE_DEREF':
-			name_index = int(code.co_code[index + 1])
+		elif opc == _STORE_DEREF:
+			name_index = co_code[index + 1]
 			if version_info >= (3, 11):
 				name_index -= code.co_nlocals
 			return code.co_cellvars[name_index]
-		elif opc in (
-			'LOAD_GLOBAL', 'LOAD_NAME', 'LOAD_ATTR', 'LOAD_FAST',
-			'LOAD_DEREF', 'DUP_TOP', 'BUILD_LIST', 'CACHE', 'COPY'
-		):
+		elif opc in _SKIP_OPCODES:
 			index += 2
 		else:
 			if default is _raise_exception: